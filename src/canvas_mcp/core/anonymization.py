@@ -172,15 +172,23 @@ KNOWN_DATA_TYPES = frozenset({'users', 'discussions', 'submissions', 'assignment
 _EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
 _PHONE_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
 _SSN_RE = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
+_DIGIT_RE = re.compile(r'\d')
 
 
 def scrub_free_text(value: Any) -> Any:
     """Redact emails, phone numbers and SSNs from a free-text string."""
     if not isinstance(value, str) or not value:
         return value
-    value = _SSN_RE.sub('[SSN_REDACTED]', value)
-    value = _EMAIL_RE.sub('[EMAIL_REDACTED]', value)
-    value = _PHONE_RE.sub('[PHONE_REDACTED]', value)
+    # Most free text has no '@' and many strings have no digits; skip the
+    # full-text scans that cannot match. The redaction markers contain
+    # neither, so checking before substituting is safe.
+    has_digits = _DIGIT_RE.search(value) is not None
+    if has_digits:
+        value = _SSN_RE.sub('[SSN_REDACTED]', value)
+    if "@" in value:
+        value = _EMAIL_RE.sub('[EMAIL_REDACTED]', value)
+    if has_digits:
+        value = _PHONE_RE.sub('[PHONE_REDACTED]', value)
     return value
 
 
@@ -1,6 +1,10 @@
 """Course caching system for Canvas API."""
 
+import asyncio
+import time
+
 from .client import fetch_all_paginated_results, make_canvas_request
+from .config import get_config
 from .logging import log_error, log_info
 from .validation import validate_params
 
@@ -8,10 +12,46 @@ from .validation import validate_params
 course_code_to_id_cache: dict[str, str] = {}
 id_to_course_code_cache: dict[str, str] = {}
 
+# Monotonic time of the last successful refresh, and the refresh currently
+# running (shared by concurrent lookups that miss the cache)
+_last_refresh_at: float | None = None
+_refresh_task: asyncio.Task[bool] | None = None
+
+
+def reset_course_cache() -> None:
+    """Discard cached course lookups (tests, and forcing a fresh /courses read)."""
+    global course_code_to_id_cache, id_to_course_code_cache, _last_refresh_at, _refresh_task
+    course_code_to_id_cache = {}
+    id_to_course_code_cache = {}
+    _last_refresh_at = None
+    _refresh_task = None
+
+
+async def _refresh_empty_course_cache() -> None:
+    """Fill an empty course cache on a lookup miss, at most once per CACHE_TTL.
+
+    Fetching /courses paginates the caller's whole enrollment, so a refresh
+    that succeeded but found no courses is not repeated on every miss until
+    the TTL has passed, and concurrent misses await the same in-flight
+    refresh. A failed refresh is retried on the next miss.
+    """
+    global _refresh_task
+
+    loop = asyncio.get_running_loop()
+    if _refresh_task is None or _refresh_task.done() or _refresh_task.get_loop() is not loop:
+        if _last_refresh_at is not None and (
+            time.monotonic() - _last_refresh_at < get_config().cache_ttl
+        ):
+            return
+        _refresh_task = loop.create_task(refresh_course_cache())
+
+    # Shielded so one cancelled caller does not cancel the shared refresh
+    await asyncio.shield(_refresh_task)
+
 
 async def refresh_course_cache() -> bool:
     """Refresh the global course cache."""
-    global course_code_to_id_cache, id_to_course_code_cache
+    global course_code_to_id_cache, id_to_course_code_cache, _last_refresh_at
 
     log_info("Refreshing course cache")
     courses = await fetch_all_paginated_results("/courses", {"per_page": 100})
@@ -20,6 +60,8 @@ async def refresh_course_cache() -> bool:
         log_error("Error building course cache", error=courses.get("error"))
         return False
 
+    _last_refresh_at = time.monotonic()
+
     # Build caches for bidirectional lookups
     course_code_to_id_cache = {}
     id_to_course_code_cache = {}
@@ -70,7 +112,7 @@ async def get_course_id(course_identifier: str | int) -> str:
     if "_" in course_str:
         # Try to refresh cache if it's not there
         if not course_code_to_id_cache:
-            await refresh_course_cache()
+            await _refresh_empty_course_cache()
             if course_str in course_code_to_id_cache:
                 return course_code_to_id_cache[course_str]
 
@@ -97,7 +139,7 @@ async def get_course_code(course_id: str | int) -> str | None:
 
     # Try to refresh cache if it's not there
     if not id_to_course_code_cache:
-        await refresh_course_cache()
+        await _refresh_empty_course_cache()
         if course_id in id_to_course_code_cache:
             return id_to_course_code_cache[course_id]
 
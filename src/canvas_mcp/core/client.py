@@ -1,10 +1,13 @@
 """HTTP client and Canvas API utilities."""
 
 import asyncio
+import math
 import re
+import time
 import weakref
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from email.utils import mktime_tz, parsedate_tz
 from typing import Any, Final, Literal, cast
 from urllib.parse import urlencode
 
@@ -17,6 +20,9 @@ from .logging import log_debug, log_error, log_warning, sanitize_url
 # Rate limit retry configuration
 MAX_RETRIES = 3
 INITIAL_BACKOFF_SECONDS = 2
+# Upper bound on a server-requested Retry-After wait. This overrides the
+# server: a longer Retry-After is shortened to this, not honored in full.
+MAX_RETRY_AFTER_SECONDS = 60
 
 # Default number of results per page for paginated requests
 DEFAULT_PAGE_SIZE = 100
@@ -24,6 +30,31 @@ API_ROOT_REST: Final = "rest"
 API_ROOT_QUIZ: Final = "quiz"
 
 
+def _retry_after_seconds(retry_after: str | None, attempt: int) -> int:
+    """Seconds to wait before retrying a 429.
+
+    Retry-After may be delta-seconds or an HTTP-date (RFC 9110). Both forms
+    are recognized without raising. The result is capped at
+    MAX_RETRY_AFTER_SECONDS even when the server asks for longer. Anything
+    unparseable, including dates outside the platform's time range, falls
+    back to exponential backoff.
+    """
+    if retry_after:
+        retry_after = retry_after.strip()
+        # isdigit() also accepts characters like '²' that int() rejects
+        if retry_after.isascii() and retry_after.isdecimal():
+            return min(int(retry_after), MAX_RETRY_AFTER_SECONDS)
+        parsed = parsedate_tz(retry_after)
+        if parsed is not None:
+            try:
+                wait = math.ceil(mktime_tz(parsed) - time.time())
+            except (OverflowError, ValueError):
+                pass
+            else:
+                return min(max(0, wait), MAX_RETRY_AFTER_SECONDS)
+    return int(INITIAL_BACKOFF_SECONDS * (2 ** attempt))
+
+
 def _canvas_auth_headers(api_token: str) -> dict[str, str]:
     """Build the standard Canvas auth + User-Agent headers for a token."""
     from .. import __version__
@@ -486,6 +517,9 @@ async def make_canvas_request(
         url = f"{base_url}{endpoint}"
         _close_client = False
 
+    # Normalized once; the retry loop below dispatches on it every attempt
+    method = method.lower()
+
     # Gate outbound calls with concurrency semaphore (uses MAX_CONCURRENT_REQUESTS)
     semaphore = _get_request_semaphore()
     async with semaphore:
@@ -498,9 +532,9 @@ async def make_canvas_request(
                         retry_info = f" (retry {attempt}/{MAX_RETRIES})" if attempt > 0 else ""
                         log_debug(f"Making {method.upper()} request to {sanitize_url(url)}{retry_info}")
 
-                    if method.lower() == "get":
+                    if method == "get":
                         response = await client.get(url, params=params)
-                    elif method.lower() == "post":
+                    elif method == "post":
                         if files:
                             # File uploads always pass dict form fields, never
                             # the list-of-tuples encoding.
@@ -523,7 +557,7 @@ async def make_canvas_request(
                                 response = await client.post(url, data=data)
                         else:
                             response = await client.post(url, json=data)
-                    elif method.lower() == "put":
+                    elif method == "put":
                         if use_form_data:
                             # Handle list of tuples separately to work around httpx async bug
                             if isinstance(data, list):
@@ -537,7 +571,7 @@ async def make_canvas_request(
                                 response = await client.put(url, data=data)
                         else:
                             response = await client.put(url, json=data)
-                    elif method.lower() == "delete":
+                    elif method == "delete":
                         response = await client.delete(url, params=params)
                     else:
                         return {"error": f"Unsupported method: {method}"}
@@ -562,15 +596,7 @@ async def make_canvas_request(
                 except httpx.HTTPStatusError as e:
                     # Handle rate limiting with exponential backoff
                     if e.response.status_code == 429 and attempt < MAX_RETRIES:
-                        # Check for Retry-After header
-                        retry_after = e.response.headers.get('Retry-After')
-                        if retry_after:
-                            try:
-                                wait_time = int(retry_after)
-                            except ValueError:
-                                wait_time = INITIAL_BACKOFF_SECONDS * (2 ** attempt)
-                        else:
-                            wait_time = INITIAL_BACKOFF_SECONDS * (2 ** attempt)
+                        wait_time = _retry_after_seconds(e.response.headers.get('Retry-After'), attempt)
 
                         log_warning(f"Rate limited (429). Retrying in {wait_time}s...", attempt=attempt + 1, max_retries=MAX_RETRIES)
                         await asyncio.sleep(wait_time)
@@ -63,6 +63,10 @@ MIME_TYPE_MAP = {
     ".ipynb": "application/x-ipynb+json",
 }
 
+# sanitize_filename: a run of characters outside alphanumerics, hyphens and
+# dots, underscores included, so one pass both replaces and collapses
+_FILENAME_UNSAFE_RUN_RE = re.compile(r'(?:[^\w\-.]|_)+')
+
 
 class FileValidationResult(NamedTuple):
     """Result of file validation.
@@ -247,15 +251,9 @@ def sanitize_filename(filename: str) -> str:
     extension = path.suffix.lower()
     stem = path.stem
 
-    # Replace spaces with underscores
-    stem = stem.replace(" ", "_")
-
-    # Remove or replace problematic characters
-    # Keep alphanumeric, underscores, hyphens, and dots
-    stem = re.sub(r'[^\w\-.]', '_', stem)
-
-    # Collapse multiple underscores
-    stem = re.sub(r'_+', '_', stem)
+    # Replace spaces and other problematic characters with a single
+    # underscore per run, keeping alphanumerics, hyphens, and dots
+    stem = _FILENAME_UNSAFE_RUN_RE.sub('_', stem)
 
     # Remove leading/trailing underscores
     stem = stem.strip('_')
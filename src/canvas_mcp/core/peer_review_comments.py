@@ -5,14 +5,176 @@ Provides comprehensive peer review comment extraction, analysis, and reporting
 capabilities for Canvas assignments.
 """
 
+import asyncio
+import hashlib
+import math
+import re
 import statistics
-from collections import Counter
+from collections import Counter, defaultdict
 from typing import Any
 
 from .anonymization import generate_anonymous_id
 from .client import fetch_all_paginated_results, make_canvas_request
+from .config import get_config
 from .dates import format_date
 
+# Student IDs per /students/submissions request; keeps the query string short
+SUBMISSION_BATCH_SIZE = 50
+
+
+def _compile_phrases(phrases: list[str]) -> re.Pattern[str] | None:
+    """Compile substring phrases into one alternation, or None if there are none.
+
+    An empty alternation would match every string, so callers must treat
+    None as "nothing to look for".
+    """
+    if not phrases:
+        return None
+    return re.compile("|".join(re.escape(phrase) for phrase in phrases))
+
+
+def _embedded_users(peer_reviews: list[Any]) -> dict[Any, dict[str, Any]]:
+    """User records embedded by include[]=user/assessor on peer_reviews, by ID.
+
+    Canvas embeds UserDisplay objects, whose name field is display_name.
+    Entries without a usable name are left out so callers can fetch them.
+    """
+    users: dict[Any, dict[str, Any]] = {}
+    for pr in peer_reviews:
+        for id_key, user_key in (("assessor_id", "assessor"), ("user_id", "user")):
+            user = pr.get(user_key)
+            if not isinstance(user, dict):
+                continue
+            name = user.get("display_name") or user.get("name")
+            if pr.get(id_key) and name:
+                users[pr[id_key]] = {"id": pr[id_key], "name": name}
+    return users
+
+
+def _index_submissions(
+    submission_responses: list[Any], include_submission_context: bool
+) -> tuple[dict[Any, dict[str, Any]], dict[tuple[Any, Any], dict[str, Any]]]:
+    """Index batched submission responses by reviewee and by comment author.
+
+    Returns (reviewee user_id -> submission context, filled only if requested;
+    (submission_id, author_id) -> that author's first comment). Only these
+    indexes outlive the call, so the raw submissions (bodies, attachments,
+    every comment) are released when it returns.
+    """
+    submission_context: dict[Any, dict[str, Any]] = {}
+    comments_by_author: dict[tuple[Any, Any], dict[str, Any]] = {}
+    for submissions_response in submission_responses:
+        if not isinstance(submissions_response, list):
+            continue
+        for sub in submissions_response:
+            if include_submission_context:
+                submission_context[sub["user_id"]] = {
+                    "submission_id": sub.get("id"),
+                    "submitted_at": format_date(sub.get("submitted_at")),
+                    "attempt": sub.get("attempt", 1)
+                }
+            for comment in sub.get("submission_comments", []):
+                comments_by_author.setdefault((sub["id"], comment.get("author_id")), comment)
+    return submission_context, comments_by_author
+
+
+def _preview(text: str, limit: int = 100) -> str:
+    """Truncate a comment for display, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class _RunningStats:
+    """Welford's online mean/variance plus min/max, accumulated in one pass."""
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: float = 0
+        self.max: float = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if self.count == 1:
+            self.min = self.max = value
+        else:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0 for fewer than two values)."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1))
+
+
+_WORD_RE = re.compile(r"\w+")
+_SIMHASH_BITS = 64
+
+
+def _simhash(text: str) -> int | None:
+    """64-bit SimHash of a comment's word 3-shingles.
+
+    Comments that differ by a few words map to signatures a small Hamming
+    distance apart. Returns None for comments too short to shingle, which
+    are not useful duplicate evidence.
+    """
+    tokens = _WORD_RE.findall(text.lower())
+    if len(tokens) < 3:
+        return None
+
+    shingles = Counter(zip(tokens, tokens[1:], tokens[2:], strict=False))
+    weights = [0] * _SIMHASH_BITS
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(" ".join(shingle).encode(), digest_size=8).digest()
+        shingle_hash = int.from_bytes(digest, "big")
+        for bit in range(_SIMHASH_BITS):
+            weights[bit] += count if shingle_hash >> bit & 1 else -count
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _find_near_duplicates(signatures: list[int | None], max_distance: int) -> set[int]:
+    """Indexes of signatures within max_distance bits of at least one other.
+
+    Signatures are split into max_distance + 1 bands; by pigeonhole, two
+    signatures within the distance agree exactly on at least one band, so
+    only signatures sharing a band bucket are compared.
+    """
+    by_signature: dict[int, list[int]] = defaultdict(list)
+    for index, signature in enumerate(signatures):
+        if signature is not None:
+            by_signature[signature].append(index)
+
+    duplicates: set[int] = set()
+    for indexes in by_signature.values():
+        if len(indexes) > 1:
+            duplicates.update(indexes)
+
+    bands = max(1, min(max_distance + 1, _SIMHASH_BITS))
+    band_width = _SIMHASH_BITS // bands
+    band_mask = (1 << band_width) - 1
+    buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for signature in by_signature:
+        matched = False
+        for band in range(bands):
+            key = (band, signature >> (band * band_width) & band_mask)
+            for other in buckets[key]:
+                if (signature ^ other).bit_count() <= max_distance:
+                    matched = True
+                    duplicates.update(by_signature[other])
+            buckets[key].append(signature)
+        if matched:
+            duplicates.update(by_signature[signature])
+
+    return duplicates
+
 
 class PeerReviewCommentAnalyzer:
     """Handles peer review comment extraction and analysis for Canvas assignments."""
@@ -36,6 +198,11 @@ class PeerReviewCommentAnalyzer:
                 'useless', 'worthless', 'garbage', 'trash'
             ]
         }
+        self.sentiment_keywords = {
+            'positive': ['good', 'great', 'excellent', 'nice', 'well', 'correct', 'clear'],
+            'negative': ['bad', 'wrong', 'poor', 'unclear', 'confusing', 'incorrect']
+        }
+        self._harsh_re = _compile_phrases(self.quality_keywords['harsh'])
 
     async def get_peer_review_comments(
         self,
@@ -44,7 +211,8 @@ class PeerReviewCommentAnalyzer:
         include_reviewer_info: bool = True,
         include_reviewee_info: bool = True,
         include_submission_context: bool = False,
-        anonymize_students: bool = False
+        anonymize_students: bool = False,
+        score_quality: bool = False
     ) -> dict[str, Any]:
         """
         Retrieve actual comment text for peer reviews on a specific assignment.
@@ -56,6 +224,8 @@ class PeerReviewCommentAnalyzer:
             include_reviewee_info: Include reviewee student information
             include_submission_context: Include original submission details
             anonymize_students: Replace student names with anonymous IDs
+            score_quality: Attach a quality_score to each review_content (used
+                by the analysis methods so each comment is scored only once)
 
         Returns:
             Dict containing assignment info, peer reviews with comments, and summary statistics
@@ -82,27 +252,66 @@ class PeerReviewCommentAnalyzer:
 
             peer_reviews: list[Any] = peer_reviews_response if isinstance(peer_reviews_response, list) else []
 
-            # Get users for name mapping if needed
-            users_map = {}
+            # Get users for name mapping if needed. The peer_reviews response
+            # already embeds user/assessor objects, but that endpoint is not
+            # behind the anonymization gate, so they are only trusted when
+            # anonymization is off; otherwise names come from /users as before.
+            users_map: dict[Any, dict[str, Any]] = {}
             if include_reviewer_info or include_reviewee_info:
-                users_response = await fetch_all_paginated_results(
-                    f"/courses/{course_id}/users",
-                    {"enrollment_type[]": "student", "per_page": 100}
-                )
-                if isinstance(users_response, list):
-                    users_map = {user["id"]: user for user in users_response}
-
-            # Get ALL submissions with comments (needed to extract peer review comments)
-            submissions_map = {}
-            submissions_by_id = {}
-            submissions_response = await fetch_all_paginated_results(
-                f"/courses/{course_id}/assignments/{assignment_id}/submissions",
-                {"include[]": ["submission_comments"], "per_page": 100}
+                if not get_config().enable_data_anonymization:
+                    users_map = _embedded_users(peer_reviews)
+
+                missing_ids = {
+                    student_id
+                    for pr in peer_reviews
+                    if pr.get("assessor_id") and pr.get("user_id")
+                    for student_id in (pr["assessor_id"], pr["user_id"])
+                } - users_map.keys()
+
+                if missing_ids:
+                    users_params: dict[str, Any] = {"enrollment_type[]": "student", "per_page": 100}
+                    if users_map:
+                        users_params["user_ids[]"] = sorted(missing_ids)
+                    users_response = await fetch_all_paginated_results(
+                        f"/courses/{course_id}/users",
+                        users_params
+                    )
+                    # Keep only the name so the full roster records can be freed
+                    if isinstance(users_response, list):
+                        users_map.update(
+                            (user["id"], {"id": user["id"], "name": user.get("name", "Unknown")})
+                            for user in users_response
+                        )
+                    del users_response
+
+            # Get submissions with comments, but only for students whose work
+            # was actually reviewed - fetched in concurrent batches instead of
+            # one sweep over every submission in the assignment
+            reviewee_ids = sorted({
+                pr["user_id"] for pr in peer_reviews
+                if pr.get("assessor_id") and pr.get("user_id")
+            })
+            batches = [
+                reviewee_ids[i:i + SUBMISSION_BATCH_SIZE]
+                for i in range(0, len(reviewee_ids), SUBMISSION_BATCH_SIZE)
+            ]
+            # The raw batches are never bound here, so they are freed as soon
+            # as they are indexed, before the per-review loop builds its output
+            submission_context, comments_by_author = _index_submissions(
+                await asyncio.gather(*(
+                    fetch_all_paginated_results(
+                        f"/courses/{course_id}/students/submissions",
+                        {
+                            "student_ids[]": batch,
+                            "assignment_ids[]": [assignment_id],
+                            "include[]": ["submission_comments"],
+                            "per_page": 100
+                        }
+                    )
+                    for batch in batches
+                )),
+                include_submission_context,
             )
-            if isinstance(submissions_response, list):
-                for sub in submissions_response:
-                    submissions_map[sub["user_id"]] = sub
-                    submissions_by_id[sub["id"]] = sub
 
             # Process peer review comments
             processed_reviews = []
@@ -110,6 +319,9 @@ class PeerReviewCommentAnalyzer:
             comments_with_text = 0
             empty_comments = 0
             total_word_count = 0
+            # Students usually appear in several reviews; resolve each
+            # (student, role) identity once per call
+            identity_cache: dict[tuple[Any, str], dict[str, str]] = {}
 
             for pr in peer_reviews:
                 reviewer_id = pr.get("assessor_id")
@@ -121,42 +333,23 @@ class PeerReviewCommentAnalyzer:
                 # Build reviewer info
                 reviewer_info = {"student_id": reviewer_id}
                 if include_reviewer_info and reviewer_id in users_map:
-                    user = users_map[reviewer_id]
-                    if anonymize_students:
-                        reviewer_info.update({
-                            "student_name": generate_anonymous_id(reviewer_id, "Student"),
-                            "anonymous_id": generate_anonymous_id(reviewer_id, "Reviewer")
-                        })
-                    else:
-                        reviewer_info.update({
-                            "student_name": user.get("name", "Unknown"),
-                            "anonymous_id": generate_anonymous_id(reviewer_id, "Reviewer")
-                        })
+                    reviewer_info.update(self._identity_fields(
+                        reviewer_id, "Reviewer", users_map[reviewer_id],
+                        anonymize_students, identity_cache
+                    ))
 
                 # Build reviewee info
                 reviewee_info = {"student_id": reviewee_id}
                 if include_reviewee_info and reviewee_id in users_map:
-                    user = users_map[reviewee_id]
-                    if anonymize_students:
-                        reviewee_info.update({
-                            "student_name": generate_anonymous_id(reviewee_id, "Student"),
-                            "anonymous_id": generate_anonymous_id(reviewee_id, "Reviewee")
-                        })
-                    else:
-                        reviewee_info.update({
-                            "student_name": user.get("name", "Unknown"),
-                            "anonymous_id": generate_anonymous_id(reviewee_id, "Reviewee")
-                        })
+                    reviewee_info.update(self._identity_fields(
+                        reviewee_id, "Reviewee", users_map[reviewee_id],
+                        anonymize_students, identity_cache
+                    ))
 
                 # Build submission info
                 submission_info = {}
-                if include_submission_context and reviewee_id in submissions_map:
-                    sub = submissions_map[reviewee_id]
-                    submission_info = {
-                        "submission_id": sub.get("id"),
-                        "submitted_at": format_date(sub.get("submitted_at")),
-                        "attempt": sub.get("attempt", 1)
-                    }
+                if reviewee_id in submission_context:
+                    submission_info = dict(submission_context[reviewee_id])
 
                 # Process comment content - Extract from submission comments
                 review_content: dict[str, Any] = {
@@ -168,36 +361,33 @@ class PeerReviewCommentAnalyzer:
                     "character_count": 0
                 }
 
-                # Get the submission that was reviewed
+                # Look up this reviewer's comment on the reviewed submission
                 asset_id = pr.get("asset_id")  # This is the submission ID
-                if asset_id and asset_id in submissions_by_id:
-                    submission = submissions_by_id[asset_id]
-                    submission_comments = submission.get("submission_comments", [])
-
-                    # Find comments from this specific reviewer
-                    for comment in submission_comments:
-                        if comment.get("author_id") == reviewer_id:
-                            comment_text = comment.get("comment", "")
-                            review_content.update({
-                                "comment_text": comment_text,
-                                "timestamp": format_date(comment.get("created_at")),
-                                "word_count": len(comment_text.split()) if comment_text else 0,
-                                "character_count": len(comment_text) if comment_text else 0
-                            })
-
-                            total_word_count += review_content["word_count"]
-                            if comment_text.strip():
-                                comments_with_text += 1
-                            else:
-                                empty_comments += 1
-                            break  # Use the first comment from this reviewer
+                comment = comments_by_author.get((asset_id, reviewer_id)) if asset_id else None
+                if comment is not None:
+                    comment_text = comment.get("comment", "")
+                    review_content.update({
+                        "comment_text": comment_text,
+                        "timestamp": format_date(comment.get("created_at")),
+                        "word_count": len(comment_text.split()) if comment_text else 0,
+                        "character_count": len(comment_text) if comment_text else 0
+                    })
+
+                    total_word_count += review_content["word_count"]
+                    if comment_text.strip():
+                        comments_with_text += 1
                     else:
-                        # No comment found from this reviewer
                         empty_comments += 1
                 else:
-                    # No submission found for this asset_id
+                    # No submission for this asset_id, or no comment from this reviewer
                     empty_comments += 1
 
+                # Score once here so the analysis passes can reuse it
+                if score_quality:
+                    review_content["quality_score"] = self._calculate_quality_score(
+                        review_content["comment_text"]
+                    )
+
                 # Try to extract rating from rubric assessments if available
                 # Note: This would require additional API calls to get rubric assessments
                 # For now, we'll leave this as placeholder
@@ -241,6 +431,29 @@ class PeerReviewCommentAnalyzer:
         except Exception as e:
             return {"error": f"Failed to get peer review comments: {str(e)}"}
 
+    @staticmethod
+    def _identity_fields(
+        student_id: Any,
+        role: str,
+        user: dict[str, Any],
+        anonymize_students: bool,
+        identity_cache: dict[tuple[Any, str], dict[str, str]]
+    ) -> dict[str, str]:
+        """Name and anonymous ID for a reviewer/reviewee, memoized per call."""
+        key = (student_id, role)
+        fields = identity_cache.get(key)
+        if fields is None:
+            if anonymize_students:
+                student_name = generate_anonymous_id(student_id, "Student")
+            else:
+                student_name = user.get("name", "Unknown")
+            fields = {
+                "student_name": student_name,
+                "anonymous_id": generate_anonymous_id(student_id, role)
+            }
+            identity_cache[key] = fields
+        return fields
+
     async def analyze_peer_review_quality(
         self,
         course_id: int | str,
@@ -263,7 +476,7 @@ class PeerReviewCommentAnalyzer:
         try:
             # First get all comments
             comments_data = await self.get_peer_review_comments(
-                course_id, assignment_id, anonymize_students=True
+                course_id, assignment_id, anonymize_students=True, score_quality=True
             )
 
             if "error" in comments_data:
@@ -274,46 +487,84 @@ class PeerReviewCommentAnalyzer:
             if not reviews:
                 return {"error": "No peer reviews found for analysis"}
 
-            # Extract comment texts for analysis
-            comment_texts = []
+            # Single pass over the reviews: every per-comment metric is folded
+            # into running counters so the comment text is only scanned once.
             word_counts = []
-            quality_scores = []
+            word_stats = _RunningStats()
             flagged_reviews = []
+            constructive_count = generic_count = specific_count = 0
+            positive_count = negative_count = neutral_count = 0
+            high_quality = medium_quality = low_quality = 0
+            quality_total = 0.0
 
             for review in reviews:
                 content = review.get("review_content", {})
                 comment_text = content.get("comment_text", "")
                 word_count = content.get("word_count", 0)
+                text_lower = comment_text.lower()
 
-                comment_texts.append(comment_text)
                 word_counts.append(word_count)
-
-                # Calculate quality score for this comment
-                quality_score = self._calculate_quality_score(comment_text)
-                quality_scores.append(quality_score)
+                word_stats.add(word_count)
+
+                quality_score = self._review_quality_score(content)
+                quality_total += quality_score
+                if quality_score >= 4.0:
+                    high_quality += 1
+                elif quality_score >= 2.0:
+                    medium_quality += 1
+                else:
+                    low_quality += 1
+
+                # Constructiveness
+                if any(word in text_lower for word in self.quality_keywords['constructive']):
+                    constructive_count += 1
+                if any(phrase in text_lower for phrase in self.quality_keywords['generic']):
+                    generic_count += 1
+                if any(word in text_lower for word in self.quality_keywords['specific']):
+                    specific_count += 1
+
+                # Sentiment
+                pos_score = sum(1 for word in self.sentiment_keywords['positive'] if word in text_lower)
+                neg_score = sum(1 for word in self.sentiment_keywords['negative'] if word in text_lower)
+                if pos_score > neg_score:
+                    positive_count += 1
+                elif neg_score > pos_score:
+                    negative_count += 1
+                else:
+                    neutral_count += 1
 
                 # Flag problematic reviews
                 if quality_score < 2.0 or word_count < 5:
                     flagged_reviews.append({
                         "review_id": review.get("review_id"),
                         "flag_reason": "low_quality" if quality_score < 2.0 else "extremely_short",
-                        "comment": comment_text[:100] + "..." if len(comment_text) > 100 else comment_text,
+                        "comment": _preview(comment_text),
                         "word_count": word_count,
                         "quality_score": round(quality_score, 1)
                     })
 
             # Calculate statistics
             total_reviews = len(reviews)
-            word_count_stats = self._calculate_word_count_stats(word_counts)
-            constructiveness_analysis = self._analyze_constructiveness(comment_texts)
-            sentiment_analysis = self._analyze_sentiment(comment_texts)
-
-            # Quality distribution
-            high_quality = sum(1 for score in quality_scores if score >= 4.0)
-            medium_quality = sum(1 for score in quality_scores if 2.0 <= score < 4.0)
-            low_quality = sum(1 for score in quality_scores if score < 2.0)
+            word_count_stats = {
+                "mean": round(word_stats.mean, 1),
+                # Median is the one statistic that still needs the values
+                "median": statistics.median(word_counts),
+                "std_dev": round(word_stats.stdev, 1),
+                "min": word_stats.min,
+                "max": word_stats.max
+            }
+            constructiveness_analysis = {
+                "constructive_feedback_count": constructive_count,
+                "generic_comments": generic_count,
+                "specific_suggestions": specific_count
+            }
+            sentiment_analysis = {
+                "positive_sentiment": round(positive_count / total_reviews, 2),
+                "neutral_sentiment": round(neutral_count / total_reviews, 2),
+                "negative_sentiment": round(negative_count / total_reviews, 2)
+            }
 
-            avg_quality_score = statistics.mean(quality_scores) if quality_scores else 0
+            avg_quality_score = quality_total / total_reviews
 
             # Generate recommendations
             recommendations = self._generate_recommendations(
@@ -387,73 +638,12 @@ class PeerReviewCommentAnalyzer:
 
         return max(0.0, min(5.0, score))
 
-    def _calculate_word_count_stats(self, word_counts: list[int]) -> dict[str, float]:
-        """Calculate word count statistics."""
-        if not word_counts:
-            return {"mean": 0, "median": 0, "std_dev": 0, "min": 0, "max": 0}
-
-        return {
-            "mean": round(statistics.mean(word_counts), 1),
-            "median": statistics.median(word_counts),
-            "std_dev": round(statistics.stdev(word_counts), 1) if len(word_counts) > 1 else 0,
-            "min": min(word_counts),
-            "max": max(word_counts)
-        }
-
-    def _analyze_constructiveness(self, comment_texts: list[str]) -> dict[str, int]:
-        """Analyze constructiveness of comments."""
-        constructive_count = 0
-        generic_count = 0
-        specific_count = 0
-
-        for text in comment_texts:
-            text_lower = text.lower()
-
-            # Check for constructive language
-            if any(word in text_lower for word in self.quality_keywords['constructive']):
-                constructive_count += 1
-
-            # Check for generic language
-            if any(phrase in text_lower for phrase in self.quality_keywords['generic']):
-                generic_count += 1
-
-            # Check for specific language
-            if any(word in text_lower for word in self.quality_keywords['specific']):
-                specific_count += 1
-
-        return {
-            "constructive_feedback_count": constructive_count,
-            "generic_comments": generic_count,
-            "specific_suggestions": specific_count
-        }
-
-    def _analyze_sentiment(self, comment_texts: list[str]) -> dict[str, float]:
-        """Basic sentiment analysis of comments."""
-        positive_words = ['good', 'great', 'excellent', 'nice', 'well', 'correct', 'clear']
-        negative_words = ['bad', 'wrong', 'poor', 'unclear', 'confusing', 'incorrect']
-
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-
-        for text in comment_texts:
-            text_lower = text.lower()
-            pos_score = sum(1 for word in positive_words if word in text_lower)
-            neg_score = sum(1 for word in negative_words if word in text_lower)
-
-            if pos_score > neg_score:
-                positive_count += 1
-            elif neg_score > pos_score:
-                negative_count += 1
-            else:
-                neutral_count += 1
-
-        total = len(comment_texts)
-        return {
-            "positive_sentiment": round(positive_count / total, 2) if total > 0 else 0,
-            "neutral_sentiment": round(neutral_count / total, 2) if total > 0 else 0,
-            "negative_sentiment": round(negative_count / total, 2) if total > 0 else 0
-        }
+    def _review_quality_score(self, content: dict[str, Any]) -> float:
+        """Quality score attached by get_peer_review_comments, computed if absent."""
+        quality_score = content.get("quality_score")
+        if quality_score is None:
+            quality_score = self._calculate_quality_score(content.get("comment_text", ""))
+        return quality_score
 
     def _generate_recommendations(
         self,
@@ -506,15 +696,18 @@ class PeerReviewCommentAnalyzer:
             default_criteria: dict[str, Any] = {
                 "min_word_count": 10,
                 "generic_phrases": ["good job", "nice work", "looks good"],
-                "max_quality_score": 2.0
+                "max_quality_score": 2.0,
+                "duplicate_max_distance": 3
             }
 
             if criteria:
                 default_criteria.update(criteria)
 
+            generic_re = _compile_phrases(default_criteria["generic_phrases"])
+
             # Get comments for analysis
             comments_data = await self.get_peer_review_comments(
-                course_id, assignment_id, anonymize_students=True
+                course_id, assignment_id, anonymize_students=True, score_quality=True
             )
 
             if "error" in comments_data:
@@ -522,8 +715,18 @@ class PeerReviewCommentAnalyzer:
 
             reviews = comments_data.get("peer_reviews", [])
             flagged_reviews = []
+            flag_summary: Counter[str] = Counter()
 
-            for review in reviews:
+            # Near-duplicate (copy-paste) detection via SimHash buckets
+            signatures = [
+                _simhash(review.get("review_content", {}).get("comment_text", ""))
+                for review in reviews
+            ]
+            duplicate_indexes = _find_near_duplicates(
+                signatures, default_criteria["duplicate_max_distance"]
+            )
+
+            for index, review in enumerate(reviews):
                 content = review.get("review_content", {})
                 comment_text = content.get("comment_text", "")
                 word_count = content.get("word_count", 0)
@@ -536,40 +739,34 @@ class PeerReviewCommentAnalyzer:
 
                 # Check for generic phrases
                 text_lower = comment_text.lower()
-                for phrase in default_criteria["generic_phrases"]:
-                    if phrase in text_lower:
-                        flags.append("generic_language")
-                        break
+                if generic_re and generic_re.search(text_lower):
+                    flags.append("generic_language")
 
                 # Check quality score
-                quality_score = self._calculate_quality_score(comment_text)
+                quality_score = self._review_quality_score(content)
                 if quality_score <= default_criteria["max_quality_score"]:
                     flags.append("low_quality")
 
-                # Check for copy-paste patterns (identical comments)
-                # This would require comparing against all other comments
+                # Check for copy-paste patterns (near-identical comments)
+                if index in duplicate_indexes:
+                    flags.append("possible_duplicate")
 
                 # Check for potentially inappropriate content
-                if any(word in text_lower for word in self.quality_keywords['harsh']):
+                if self._harsh_re and self._harsh_re.search(text_lower):
                     flags.append("potentially_harsh")
 
                 if flags:
+                    flag_summary.update(flags)
                     flagged_reviews.append({
                         "review_id": review.get("review_id"),
                         "reviewer_id": review.get("reviewer", {}).get("anonymous_id", "Unknown"),
                         "reviewee_id": review.get("reviewee", {}).get("anonymous_id", "Unknown"),
                         "flags": flags,
-                        "comment_preview": comment_text[:100] + "..." if len(comment_text) > 100 else comment_text,
+                        "comment_preview": _preview(comment_text),
                         "word_count": word_count,
                         "quality_score": round(quality_score, 1)
                     })
 
-            # Categorize flags
-            flag_summary: Counter[str] = Counter()
-            for review in flagged_reviews:
-                for flag in review["flags"]:
-                    flag_summary[flag] += 1
-
             result = {
                 "total_reviews_analyzed": len(reviews),
                 "total_flagged": len(flagged_reviews),
@@ -5,13 +5,77 @@ Provides comprehensive peer review tracking and analytics capabilities
 for Canvas assignments with accurate reviewer-to-reviewee mapping.
 """
 
+import asyncio
+import copy
 import datetime
+import hashlib
+import io
+import json
+import time
+from collections import defaultdict
 from typing import Any
 
 from .client import fetch_all_paginated_results, make_canvas_request
+from .config import get_config
+from .credentials import get_request_credentials
 from .csv_safety import csv_safe_cell, rows_to_csv_string
 from .dates import parse_date
 
+# How long get_completion_analytics results are reused. Short: this only
+# exists to collapse back-to-back report/follow-up calls, not to serve stale
+# completion data.
+ANALYTICS_CACHE_TTL_SECONDS = 30
+
+# cache key -> (expires_at_monotonic, analytics result)
+_analytics_cache: dict[tuple[Any, ...], tuple[float, dict[str, Any]]] = {}
+
+
+def reset_analytics_cache() -> None:
+    """Discard cached completion analytics (tests, and forced refresh)."""
+    _analytics_cache.clear()
+
+
+def _evict_expired_analytics() -> None:
+    """Drop timed-out cache entries so the map cannot grow without bound."""
+    now = time.monotonic()
+    for key in [k for k, (expiry, _) in _analytics_cache.items() if expiry < now]:
+        _analytics_cache.pop(key, None)
+
+
+def _analytics_cache_key(
+    course_id: int | str,
+    assignment_id: int,
+    include_student_details: bool,
+    group_by_status: bool
+) -> tuple[Any, ...]:
+    """Cache key scoped to the caller's token and the anonymization setting.
+
+    In HTTP mode every request carries its own Canvas token, and what Canvas
+    returns depends on it, so one caller must never be served another's
+    result. The token is keyed by digest so it is not held in the map.
+    """
+    credentials = get_request_credentials()
+    caller = (
+        hashlib.sha256(credentials.api_token.encode()).hexdigest()
+        if credentials else None
+    )
+    return (
+        caller,
+        get_config().enable_data_anonymization,
+        str(course_id),
+        str(assignment_id),
+        include_student_details,
+        group_by_status,
+    )
+
+
+def _format_pending(student: dict[str, Any]) -> str:
+    """A student's pending reviews as "Name (id); Name (id)"."""
+    return "; ".join(
+        f"{pr['reviewee_name']} ({pr['reviewee_id']})"
+        for pr in student.get("pending_reviews", ())
+    )
+
 
 class PeerReviewAnalyzer:
     """Handles peer review analytics and reporting for Canvas assignments."""
@@ -29,205 +93,284 @@ class PeerReviewAnalyzer:
         """Get peer review assignments with clear reviewer-reviewee mapping."""
 
         try:
-            # Get assignment details
-            assignment_response = await make_canvas_request(
-                "get",
-                f"/courses/{course_id}/assignments/{assignment_id}"
-            )
+            result, _ = await self._collect_assignments(course_id, assignment_id, include_names)
+            return result
 
-            if "error" in assignment_response:
-                return {"error": f"Failed to get assignment: {assignment_response['error']}"}
+        except Exception as e:
+            return {"error": f"Exception in get_assignments: {str(e)}"}
+
+    async def _collect_assignments(
+        self,
+        course_id: int | str,
+        assignment_id: int,
+        include_names: bool
+    ) -> tuple[dict[str, Any], Any]:
+        """Build the get_assignments result, also returning the raw roster response.
 
-            # Get peer reviews
-            peer_reviews_response = await make_canvas_request(
+        The roster (None unless include_names) is handed back so callers that
+        need the student list can reuse it instead of paginating /users again.
+        """
+        # The assignment, its peer reviews and (optionally) the roster are
+        # independent, so request them concurrently
+        requests = [
+            make_canvas_request(
+                "get",
+                f"/courses/{course_id}/assignments/{assignment_id}"
+            ),
+            make_canvas_request(
                 "get",
                 f"/courses/{course_id}/assignments/{assignment_id}/peer_reviews"
-            )
-
-            if "error" in peer_reviews_response:
-                return {"error": f"Failed to get peer reviews: {peer_reviews_response['error']}"}
-
-            peer_reviews: list[Any] = peer_reviews_response if isinstance(peer_reviews_response, list) else []
+            ),
+        ]
+        if include_names:
+            # 100 is Canvas's per_page ceiling. Asking for more still returns
+            # 100 rows, which fetch_all_paginated_results reads as a short
+            # final page, silently truncating rosters over 100 students.
+            requests.append(fetch_all_paginated_results(
+                f"/courses/{course_id}/users",
+                {"enrollment_type[]": "student", "per_page": 100}
+            ))
+
+        responses = await asyncio.gather(*requests)
+        assignment_response, peer_reviews_response = responses[0], responses[1]
+        users_response = responses[2] if include_names else None
+
+        if "error" in assignment_response:
+            return {"error": f"Failed to get assignment: {assignment_response['error']}"}, users_response
+
+        if "error" in peer_reviews_response:
+            return {"error": f"Failed to get peer reviews: {peer_reviews_response['error']}"}, users_response
+
+        peer_reviews: list[Any] = peer_reviews_response if isinstance(peer_reviews_response, list) else []
+
+        # Map user IDs to names if requested
+        users_map = {}
+        if isinstance(users_response, list):
+            users_map = {user["id"]: user.get("name", "Unknown") for user in users_response}
+
+        # Process peer review data
+        assignments_list = []
+        for pr in peer_reviews:
+            reviewer_id = pr.get("assessor_id")
+            reviewee_id = pr.get("user_id")
+
+            if not reviewer_id or not reviewee_id:
+                continue
+
+            completed = pr.get("workflow_state") == "completed"
+            assignment_entry = {
+                "reviewer_id": reviewer_id,
+                "reviewee_id": reviewee_id,
+                "submission_id": pr.get("submission_id"),
+                "status": "completed" if completed else "assigned",
+                "assigned_date": pr.get("created_at"),
+                "completed_date": pr.get("updated_at") if completed else None,
+                "has_comments": bool(pr.get("comment")),
+                "rubric_completed": bool(pr.get("rubric_assessment_id")),
+                "peer_review_id": pr.get("id")
+            }
 
-            # Get users if names are requested
-            users_map = {}
             if include_names:
-                users_response = await fetch_all_paginated_results(
-                    f"/courses/{course_id}/users",
-                    {"enrollment_type[]": "student", "per_page": 100}
-                )
-                if isinstance(users_response, list):
-                    users_map = {user["id"]: user.get("name", "Unknown") for user in users_response}
-
-            # Process peer review data
-            assignments_list = []
-            for pr in peer_reviews:
-                reviewer_id = pr.get("assessor_id")
-                reviewee_id = pr.get("user_id")
-
-                if not reviewer_id or not reviewee_id:
-                    continue
-
-                assignment_entry = {
-                    "reviewer_id": reviewer_id,
-                    "reviewee_id": reviewee_id,
-                    "submission_id": pr.get("submission_id"),
-                    "status": "completed" if pr.get("workflow_state") == "completed" else "assigned",
-                    "assigned_date": pr.get("created_at"),
-                    "completed_date": pr.get("updated_at") if pr.get("workflow_state") == "completed" else None,
-                    "has_comments": bool(pr.get("comment")),
-                    "rubric_completed": bool(pr.get("rubric_assessment_id")),
-                    "peer_review_id": pr.get("id")
-                }
+                assignment_entry["reviewer_name"] = users_map.get(reviewer_id, "Unknown")
+                assignment_entry["reviewee_name"] = users_map.get(reviewee_id, "Unknown")
+
+            assignments_list.append(assignment_entry)
+
+        # Calculate peer review settings
+        peer_review_settings = {
+            "anonymous": assignment_response.get("anonymous_peer_reviews", False),
+            "automatic": assignment_response.get("automatic_peer_reviews", False),
+            "reviews_per_student": assignment_response.get("peer_review_count", 0)
+        }
+
+        return {
+            "assignment_info": {
+                "id": assignment_response.get("id"),
+                "name": assignment_response.get("name"),
+                "course_id": course_id,
+                "total_reviews_assigned": len(assignments_list),
+                "peer_review_settings": peer_review_settings
+            },
+            "assignments": assignments_list
+        }, users_response
 
-                if include_names:
-                    assignment_entry["reviewer_name"] = users_map.get(reviewer_id, "Unknown")
-                    assignment_entry["reviewee_name"] = users_map.get(reviewee_id, "Unknown")
-
-                assignments_list.append(assignment_entry)
+    async def get_completion_analytics(
+        self,
+        course_id: int | str,
+        assignment_id: int,
+        include_student_details: bool = True,
+        group_by_status: bool = True
+    ) -> dict[str, Any]:
+        """Get detailed analytics on peer review completion rates.
 
-            # Calculate peer review settings
-            peer_review_settings = {
-                "anonymous": assignment_response.get("anonymous_peer_reviews", False),
-                "automatic": assignment_response.get("automatic_peer_reviews", False),
-                "reviews_per_student": assignment_response.get("peer_review_count", 0)
-            }
+        Results are cached briefly (see ANALYTICS_CACHE_TTL_SECONDS) so that a
+        report and a follow-up list requested back to back share one set of
+        Canvas calls. Each caller gets its own copy.
+        """
+        key = _analytics_cache_key(course_id, assignment_id, include_student_details, group_by_status)
+        cached = _analytics_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
 
-            return {
-                "assignment_info": {
-                    "id": assignment_response.get("id"),
-                    "name": assignment_response.get("name"),
-                    "course_id": course_id,
-                    "total_reviews_assigned": len(assignments_list),
-                    "peer_review_settings": peer_review_settings
-                },
-                "assignments": assignments_list
-            }
+        result = await self._compute_completion_analytics(
+            course_id, assignment_id, include_student_details, group_by_status
+        )
 
-        except Exception as e:
-            return {"error": f"Exception in get_assignments: {str(e)}"}
+        if "error" not in result:
+            _evict_expired_analytics()
+            _analytics_cache[key] = (
+                time.monotonic() + ANALYTICS_CACHE_TTL_SECONDS, copy.deepcopy(result)
+            )
+        return result
 
-    async def get_completion_analytics(
+    async def _compute_completion_analytics(
         self,
         course_id: int | str,
         assignment_id: int,
-        include_student_details: bool = True,
-        group_by_status: bool = True
+        include_student_details: bool,
+        group_by_status: bool
     ) -> dict[str, Any]:
-        """Get detailed analytics on peer review completion rates."""
+        """Fetch and aggregate completion analytics (uncached)."""
 
         try:
-            # Get the assignments data
-            assignments_data = await self.get_assignments(
+            # Get the assignments data, reusing its roster as the student list
+            assignments_data, users_response = await self._collect_assignments(
                 course_id, assignment_id, include_names=True
             )
 
             if "error" in assignments_data:
                 return assignments_data
 
-            assignments = assignments_data["assignments"]
-
-            # Get all students in the course
-            users_response = await fetch_all_paginated_results(
-                f"/courses/{course_id}/users",
-                {"enrollment_type[]": "student", "per_page": 100}
-            )
-
             if "error" in users_response:
                 return {"error": f"Failed to get users: {users_response}"}
 
             students = users_response if isinstance(users_response, list) else []
 
-            # Calculate completion statistics
-            reviewer_stats = {}
-            total_assigned = len(assignments)
-            total_completed = sum(1 for a in assignments if a["status"] == "completed")
-
-            # Group assignments by reviewer
-            for assignment in assignments:
-                reviewer_id = assignment["reviewer_id"]
-                if reviewer_id not in reviewer_stats:
-                    reviewer_stats[reviewer_id] = {
-                        "student_id": reviewer_id,
-                        "student_name": assignment.get("reviewer_name", "Unknown"),
-                        "assigned_count": 0,
-                        "completed_count": 0,
-                        "pending_reviews": []
-                    }
-
-                reviewer_stats[reviewer_id]["assigned_count"] += 1
-
-                if assignment["status"] == "completed":
-                    reviewer_stats[reviewer_id]["completed_count"] += 1
-                else:
-                    # Calculate days since assigned
-                    days_since_assigned = 0
-                    if assignment.get("assigned_date"):
-                        assigned_date = parse_date(assignment["assigned_date"])
-                        if assigned_date:
-                            days_since_assigned = (
-                                datetime.datetime.now(datetime.timezone.utc) - assigned_date
-                            ).days
-
-                    reviewer_stats[reviewer_id]["pending_reviews"].append({
-                        "reviewee_id": assignment["reviewee_id"],
-                        "reviewee_name": assignment.get("reviewee_name", "Unknown"),
-                        "days_since_assigned": days_since_assigned
-                    })
-
-            # Calculate completion rates
-            for stats in reviewer_stats.values():
-                if stats["assigned_count"] > 0:
-                    stats["completion_rate"] = (stats["completed_count"] / stats["assigned_count"]) * 100
-                else:
-                    stats["completion_rate"] = 0.0
-
-            # Group by completion status
-            completion_groups: dict[str, list[Any]] = {
-                "all_complete": [],
-                "partial_complete": [],
-                "none_complete": []
-            }
+            return self._analytics_from_assignments(
+                assignments_data, students, include_student_details, group_by_status
+            )
 
-            if group_by_status:
-                for stats in reviewer_stats.values():
-                    if stats["completion_rate"] == 100.0:
-                        completion_groups["all_complete"].append(stats)
-                    elif stats["completion_rate"] == 0.0:
-                        completion_groups["none_complete"].append(stats)
-                    else:
-                        completion_groups["partial_complete"].append(stats)
-
-            # Calculate summary statistics
-            students_with_submissions = len([s for s in students if any(
-                a["reviewee_id"] == s["id"] for a in assignments
-            )])
-
-            completion_rate = (total_completed / total_assigned * 100) if total_assigned > 0 else 0
-
-            reviews_per_student = assignments_data["assignment_info"]["peer_review_settings"]["reviews_per_student"]
-
-            summary = {
-                "total_students_enrolled": len(students),
-                "students_with_submissions": students_with_submissions,
-                "total_reviews_assigned": total_assigned,
-                "reviews_completed": total_completed,
-                "completion_rate_percent": round(completion_rate, 1),
-                "students_all_complete": len(completion_groups["all_complete"]),
-                "students_partial_complete": len(completion_groups["partial_complete"]),
-                "students_none_complete": len(completion_groups["none_complete"]),
-                "average_reviews_per_student": reviews_per_student
-            }
+        except Exception as e:
+            return {"error": f"Exception in get_completion_analytics: {str(e)}"}
 
-            result = {"summary": summary}
+    def _analytics_from_assignments(
+        self,
+        assignments_data: dict[str, Any],
+        students: list[dict[str, Any]],
+        include_student_details: bool,
+        group_by_status: bool
+    ) -> dict[str, Any]:
+        """Aggregate completion analytics from already-fetched data (no I/O)."""
+        assignments = assignments_data["assignments"]
+
+        # Calculate completion statistics
+        reviewer_stats: defaultdict[Any, dict[str, Any]] = defaultdict(lambda: {
+            "student_id": None,
+            "student_name": "Unknown",
+            "assigned_count": 0,
+            "completed_count": 0,
+            "pending_reviews": []
+        })
+        total_assigned = len(assignments)
+        total_completed = 0
+
+        # Canvas assigns reviews in batches, so many share a created_at;
+        # work out each distinct timestamp's age once against a single "now"
+        now_utc = datetime.datetime.now(datetime.timezone.utc)
+        days_since: dict[str, int] = {}
+
+        # Group assignments by reviewer
+        for assignment in assignments:
+            reviewer_id = assignment["reviewer_id"]
+            stats = reviewer_stats[reviewer_id]
+            if stats["student_id"] is None:
+                stats["student_id"] = reviewer_id
+                stats["student_name"] = assignment.get("reviewer_name", "Unknown")
+
+            stats["assigned_count"] += 1
+
+            if assignment["status"] == "completed":
+                stats["completed_count"] += 1
+                total_completed += 1
+            elif include_student_details:
+                # Calculate days since assigned
+                days_since_assigned = 0
+                raw_date = assignment.get("assigned_date")
+                if raw_date:
+                    cached_days = days_since.get(raw_date)
+                    if cached_days is None:
+                        assigned_date = parse_date(raw_date)
+                        cached_days = (now_utc - assigned_date).days if assigned_date else 0
+                        days_since[raw_date] = cached_days
+                    days_since_assigned = cached_days
+
+                stats["pending_reviews"].append({
+                    "reviewee_id": assignment["reviewee_id"],
+                    "reviewee_name": assignment.get("reviewee_name", "Unknown"),
+                    "days_since_assigned": days_since_assigned
+                })
+
+        # Calculate completion rates and classify by completion status in
+        # one pass over reviewer_stats. The summary only needs counts; the
+        # per-student groups are built only when they are returned.
+        completion_groups: dict[str, list[Any]] = {
+            "all_complete": [],
+            "partial_complete": [],
+            "none_complete": []
+        }
+        build_groups = group_by_status and include_student_details
+        all_complete_count = partial_complete_count = none_complete_count = 0
+
+        for stats in reviewer_stats.values():
+            assigned_count = stats["assigned_count"]
+            completed_count = stats["completed_count"]
+            if assigned_count > 0:
+                stats["completion_rate"] = (completed_count / assigned_count) * 100
+            else:
+                stats["completion_rate"] = 0.0
+
+            if assigned_count and completed_count == assigned_count:
+                all_complete_count += 1
+                group = "all_complete"
+            elif completed_count == 0:
+                none_complete_count += 1
+                group = "none_complete"
+            else:
+                partial_complete_count += 1
+                group = "partial_complete"
 
-            if include_student_details:
-                result["completion_groups"] = completion_groups
+            if build_groups:
+                completion_groups[group].append(stats)
 
-            return result
+        # Calculate summary statistics
+        reviewee_ids = {a["reviewee_id"] for a in assignments}
+        students_with_submissions = sum(1 for s in students if s["id"] in reviewee_ids)
 
-        except Exception as e:
-            return {"error": f"Exception in get_completion_analytics: {str(e)}"}
+        completion_rate = (total_completed / total_assigned * 100) if total_assigned > 0 else 0
+
+        reviews_per_student = assignments_data["assignment_info"]["peer_review_settings"]["reviews_per_student"]
+
+        summary = {
+            "total_students_enrolled": len(students),
+            "students_with_submissions": students_with_submissions,
+            "total_reviews_assigned": total_assigned,
+            "reviews_completed": total_completed,
+            "completion_rate_percent": round(completion_rate, 1),
+            "students_all_complete": all_complete_count,
+            "students_partial_complete": partial_complete_count,
+            "students_none_complete": none_complete_count,
+            "average_reviews_per_student": reviews_per_student
+        }
+
+        result = {
+            "assignment_info": assignments_data["assignment_info"],
+            "summary": summary
+        }
+
+        if include_student_details:
+            result["completion_groups"] = completion_groups
+
+        return result
 
     async def generate_report(
         self,
@@ -250,12 +393,8 @@ class PeerReviewAnalyzer:
             if "error" in analytics:
                 return analytics
 
-            # Get assignment info
-            assignments_data = await self.get_assignments(course_id, assignment_id)
-            if "error" in assignments_data:
-                return assignments_data
-
-            assignment_info = assignments_data["assignment_info"]
+            # Assignment info comes back with the analytics; no second fetch
+            assignment_info = analytics.pop("assignment_info")
 
             if report_format == "markdown":
                 return self._generate_markdown_report(
@@ -265,11 +404,13 @@ class PeerReviewAnalyzer:
             elif report_format == "csv":
                 return self._generate_csv_report(analytics, assignment_info)
             elif report_format == "json":
-                return {
+                # Serialized here, like the other formats, so the tool can
+                # return or save it without a second encoding pass
+                return {"report": json.dumps({
                     "assignment_info": assignment_info,
                     "analytics": analytics,
                     "generated_at": datetime.datetime.now().isoformat()
-                }
+                }, indent=2)}
             else:
                 return {"error": f"Unsupported report format: {report_format}"}
 
@@ -285,39 +426,42 @@ class PeerReviewAnalyzer:
         include_action_items: bool,
         include_timeline_analysis: bool
     ) -> dict[str, str]:
-        """Generate a markdown-formatted report."""
+        """Generate a markdown-formatted report.
+
+        Lines are written straight into one buffer, each terminated by a
+        newline; the final newline is dropped on return.
+        """
 
         summary = analytics["summary"]
         completion_groups = analytics.get("completion_groups", {})
 
-        report_lines = []
+        buffer = io.StringIO()
+        w = buffer.write
 
         # Header
-        report_lines.extend([
-            "# Peer Review Completion Report",
-            f"**Assignment:** {assignment_info['name']} (ID: {assignment_info['id']})",
-            f"**Generated:** {datetime.datetime.now().strftime('%B %d, %Y')}",
-            "",
-            "---",
-            ""
-        ])
+        w("# Peer Review Completion Report\n")
+        w(f"**Assignment:** {assignment_info['name']} (ID: {assignment_info['id']})\n")
+        w(f"**Generated:** {datetime.datetime.now().strftime('%B %d, %Y')}\n")
+        w("\n---\n\n")
 
         # Executive Summary
         if include_executive_summary:
-            report_lines.extend([
-                "## Executive Summary",
-                "",
-                "| Metric | Count | Percentage |",
-                "|--------|-------|------------|",
-                f"| **Total Students Enrolled** | {summary['total_students_enrolled']} | 100% |",
-                f"| **Students with Submissions** | {summary['students_with_submissions']} | {round(summary['students_with_submissions']/summary['total_students_enrolled']*100, 1)}% |",
-                f"| **Total Peer Reviews Assigned** | {summary['total_reviews_assigned']} | - |",
-                f"| **Peer Reviews Completed** | {summary['reviews_completed']} | {summary['completion_rate_percent']}% |",
-                f"| **Students with All Reviews Complete** | {summary['students_all_complete']} | {round(summary['students_all_complete']/summary['total_students_enrolled']*100, 1)}% |",
-                "",
-                "---",
-                ""
-            ])
+            # A course with no enrolled students reports 0% rather than raising
+            enrolled = summary['total_students_enrolled']
+            with_submissions = summary['students_with_submissions']
+            all_complete = summary['students_all_complete']
+            w(
+                "## Executive Summary\n"
+                "\n"
+                "| Metric | Count | Percentage |\n"
+                "|--------|-------|------------|\n"
+            )
+            w(f"| **Total Students Enrolled** | {enrolled} | 100% |\n")
+            w(f"| **Students with Submissions** | {with_submissions} | {round(with_submissions / enrolled * 100, 1) if enrolled else 0.0}% |\n")
+            w(f"| **Total Peer Reviews Assigned** | {summary['total_reviews_assigned']} | - |\n")
+            w(f"| **Peer Reviews Completed** | {summary['reviews_completed']} | {summary['completion_rate_percent']}% |\n")
+            w(f"| **Students with All Reviews Complete** | {all_complete} | {round(all_complete / enrolled * 100, 1) if enrolled else 0.0}% |\n")
+            w("\n---\n\n")
 
         # Action items
         if include_action_items:
@@ -325,99 +469,81 @@ class PeerReviewAnalyzer:
             partial_students = completion_groups.get("partial_complete", [])
 
             if urgent_students:
-                report_lines.extend([
-                    "## 🚨 Immediate Action Required",
-                    "",
-                    f"**Students with NO peer reviews completed ({len(urgent_students)} students):**",
-                ])
+                w("## 🚨 Immediate Action Required\n\n")
+                w(f"**Students with NO peer reviews completed ({len(urgent_students)} students):**\n")
 
                 for student in urgent_students[:5]:  # Show first 5
                     pending_reviews = student.get("pending_reviews", [])
                     reviewee_names = [pr["reviewee_name"] for pr in pending_reviews[:2]]
-                    report_lines.append(
+                    w(
                         f"- {student['student_name']} (ID: {student['student_id']}): "
                         f"Assigned to review {' and '.join(reviewee_names)} "
-                        f"({student['completed_count']}/{student['assigned_count']} complete)"
+                        f"({student['completed_count']}/{student['assigned_count']} complete)\n"
                     )
 
                 if len(urgent_students) > 5:
-                    report_lines.append(f"- [{len(urgent_students) - 5} more students...]")
-
-                report_lines.extend([
-                    "",
-                    "**Contact Information:**",
-                    "- Send urgent reminder emails",
-                    "- Consider deadline extensions",
-                    "- Follow up within 24 hours",
-                    "",
-                    "---",
-                    ""
-                ])
+                    w(f"- [{len(urgent_students) - 5} more students...]\n")
+
+                w(
+                    "\n"
+                    "**Contact Information:**\n"
+                    "- Send urgent reminder emails\n"
+                    "- Consider deadline extensions\n"
+                    "- Follow up within 24 hours\n"
+                    "\n---\n\n"
+                )
 
             if partial_students:
-                report_lines.extend([
-                    "## ⚠️ Partial Completion Follow-up",
-                    "",
-                    f"**Students with partial reviews completed ({len(partial_students)} students):**",
-                ])
+                w("## ⚠️ Partial Completion Follow-up\n\n")
+                w(f"**Students with partial reviews completed ({len(partial_students)} students):**\n")
 
                 for student in partial_students[:5]:  # Show first 5
                     pending_reviews = student.get("pending_reviews", [])
                     if pending_reviews:
                         pending_name = pending_reviews[0]["reviewee_name"]
-                        report_lines.append(
+                        w(
                             f"- {student['student_name']}: "
                             f"{student['completed_count']}/{student['assigned_count']} complete, "
-                            f"pending review of {pending_name}"
+                            f"pending review of {pending_name}\n"
                         )
 
                 if len(partial_students) > 5:
-                    report_lines.append(f"- [{len(partial_students) - 5} more students...]")
+                    w(f"- [{len(partial_students) - 5} more students...]\n")
 
-                report_lines.extend([
-                    "",
-                    "---",
-                    ""
-                ])
+                w("\n---\n\n")
 
         # Fully engaged students
         complete_students = completion_groups.get("all_complete", [])
         if complete_students:
-            report_lines.extend([
-                f"## ✅ Fully Engaged Students ({len(complete_students)} students)",
-                "",
-                "**Students with all peer reviews completed:**",
-                "- High participation rate indicates good course engagement",
-                "- Consider highlighting exemplary completion in class",
-                "",
-                "---",
-                ""
-            ])
+            w(f"## ✅ Fully Engaged Students ({len(complete_students)} students)\n")
+            w(
+                "\n"
+                "**Students with all peer reviews completed:**\n"
+                "- High participation rate indicates good course engagement\n"
+                "- Consider highlighting exemplary completion in class\n"
+                "\n---\n\n"
+            )
 
         # Recommendations
         if include_action_items:
-            report_lines.extend([
-                "## Recommendations",
-                "",
-                "### Immediate (Next 24 hours)",
-                f"1. Contact {len(urgent_students)} students with zero completions",
-                f"2. Send automated reminder to {len(partial_students)} partial completions",
-                "",
-                "### Short-term (Next week)",
-                "1. Review peer review assignment timing",
-                "2. Consider automated reminders for future assignments",
-                "",
-                "### Process Improvements",
-                "1. Set peer review assignments 24-48 hours after due date",
-                "2. Implement interim completion checkpoints",
-                "3. Add peer review completion to participation grade",
-                "",
-                "---",
-                "",
-                "*Report generated using Canvas Peer Review Analytics Tool*"
-            ])
-
-        return {"report": "\n".join(report_lines)}
+            w("## Recommendations\n\n### Immediate (Next 24 hours)\n")
+            w(f"1. Contact {len(urgent_students)} students with zero completions\n")
+            w(f"2. Send automated reminder to {len(partial_students)} partial completions\n")
+            w(
+                "\n"
+                "### Short-term (Next week)\n"
+                "1. Review peer review assignment timing\n"
+                "2. Consider automated reminders for future assignments\n"
+                "\n"
+                "### Process Improvements\n"
+                "1. Set peer review assignments 24-48 hours after due date\n"
+                "2. Implement interim completion checkpoints\n"
+                "3. Add peer review completion to participation grade\n"
+                "\n---\n\n"
+                "*Report generated using Canvas Peer Review Analytics Tool*\n"
+            )
+
+        return {"report": buffer.getvalue()[:-1]}
 
     def _generate_csv_report(self, analytics: dict[str, Any], assignment_info: dict[str, Any]) -> dict[str, str]:
         """Generate a CSV-formatted report.
@@ -436,29 +562,26 @@ class PeerReviewAnalyzer:
 
         completion_groups = analytics.get("completion_groups", {})
 
-        def pending(student: dict[str, Any]) -> str:
-            return "; ".join([
-                f"{pr['reviewee_name']} ({pr['reviewee_id']})"
-                for pr in student.get("pending_reviews", [])
-            ])
-
-        rows: list[list[Any]] = []
-        for group, status, priority in (
-            ("none_complete", "none_complete", "urgent"),
-            ("partial_complete", "partial_complete", "medium"),
-            ("all_complete", "all_complete", "low"),
-        ):
-            for student in completion_groups.get(group, []):
-                rows.append([
-                    student["student_id"],
-                    csv_safe_cell(student["student_name"]),
-                    student["assigned_count"],
-                    student["completed_count"],
-                    student["completion_rate"],
-                    status,
-                    csv_safe_cell(pending(student)) if group != "all_complete" else "",
-                    priority,
-                ])
+        # Rows are streamed straight into the csv writer rather than
+        # collected into an intermediate list first
+        rows = (
+            [
+                student["student_id"],
+                csv_safe_cell(student["student_name"]),
+                student["assigned_count"],
+                student["completed_count"],
+                student["completion_rate"],
+                status,
+                csv_safe_cell(_format_pending(student)) if group != "all_complete" else "",
+                priority,
+            ]
+            for group, status, priority in (
+                ("none_complete", "none_complete", "urgent"),
+                ("partial_complete", "partial_complete", "medium"),
+                ("all_complete", "all_complete", "low"),
+            )
+            for student in completion_groups.get(group, [])
+        )
 
         return {"report": rows_to_csv_string(header, rows)}
 
@@ -481,27 +604,28 @@ class PeerReviewAnalyzer:
             if "error" in analytics:
                 return analytics
 
-            # Get assignment info
-            assignments_data = await self.get_assignments(course_id, assignment_id)
-            if "error" in assignments_data:
-                return assignments_data
-
-            assignment_info = assignments_data["assignment_info"]
+            # Assignment info comes back with the analytics; no second fetch
+            assignment_info = analytics.pop("assignment_info")
             completion_groups = analytics.get("completion_groups", {})
 
             # Calculate days since assignment
             days_since_assigned = days_threshold  # Default value
 
+            # Counts are taken before priority_filter drops any category, so
+            # the recommended actions below always reflect the whole class
+            urgent_count = len(completion_groups.get("none_complete", []))
+            medium_count = len(completion_groups.get("partial_complete", []))
+
             # Process followup categories
             followup_categories: dict[str, dict[str, Any]] = {
                 "urgent": {
                     "description": "Students with 0 peer reviews completed",
-                    "count": len(completion_groups.get("none_complete", [])),
+                    "count": urgent_count,
                     "students": []
                 },
                 "medium": {
                     "description": "Students with partial completion",
-                    "count": len(completion_groups.get("partial_complete", [])),
+                    "count": medium_count,
                     "students": []
                 },
                 "low": {
@@ -510,8 +634,12 @@ class PeerReviewAnalyzer:
                 }
             }
 
+            # Only build the student lists that survive priority_filter
+            urgent_students = completion_groups.get("none_complete", []) if priority_filter in ("all", "urgent") else []
+            medium_students = completion_groups.get("partial_complete", []) if priority_filter in ("all", "medium") else []
+
             # Add urgent students
-            for student in completion_groups.get("none_complete", []):
+            for student in urgent_students:
                 student_data = {
                     "student_id": student["student_id"],
                     "student_name": student["student_name"],
@@ -529,7 +657,7 @@ class PeerReviewAnalyzer:
                 followup_categories["urgent"]["students"].append(student_data)
 
             # Add medium priority students
-            for student in completion_groups.get("partial_complete", []):
+            for student in medium_students:
                 student_data = {
                     "student_id": student["student_id"],
                     "student_name": student["student_name"],
@@ -553,10 +681,10 @@ class PeerReviewAnalyzer:
             # Generate recommended actions
             recommended_actions = {
                 "immediate": [
-                    f"Send urgent emails to {followup_categories.get('urgent', {}).get('count', 0)} students with zero completion"
+                    f"Send urgent emails to {urgent_count} students with zero completion"
                 ],
                 "this_week": [
-                    f"Send automated reminder to {followup_categories.get('medium', {}).get('count', 0)} partial completion students",
+                    f"Send automated reminder to {medium_count} partial completion students",
                     "Review peer review timing for future assignments"
                 ],
                 "next_assignment": [
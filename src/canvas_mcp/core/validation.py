@@ -309,6 +309,13 @@ def validate_parameter(param_name: str, value: Any, expected_type: Any) -> Any:
     Raises:
         ValueError: If validation fails
     """
+    # Already exactly the expected class (an int for int, a str for str, ...):
+    # every converter returns such a value unchanged, so skip the type
+    # introspection below. Exact type, not isinstance, so a bool passed for
+    # an int parameter is still converted.
+    if type(value) is expected_type:
+        return value
+
     # Special handling for Union types (e.g., Union[int, str])
     origin = get_origin(expected_type)
     args = get_args(expected_type)
@@ -352,33 +359,100 @@ def validate_parameter(param_name: str, value: Any, expected_type: Any) -> Any:
                     f"is not compatible with expected type: {expected_type}")
 
 
+def _parameter_validator(expected_type: Any) -> Callable[[str, Any], Any]:
+    """Specialize validate_parameter for one annotation.
+
+    The Optional/Union/Literal decomposition depends only on the annotation,
+    so for plain and Optional basic types (int, str | None, list[str], ...) it
+    is done here once and the returned callable goes straight to the
+    converter. Other annotations keep the general validate_parameter path.
+    """
+    origin = get_origin(expected_type)
+    args = get_args(expected_type)
+
+    is_optional = False
+    inner_type = expected_type
+    if origin in (Union, types.UnionType) and args and type(None) in args:
+        is_optional = True
+        inner_type, origin, args = _validate_optional("", None, args)
+
+    converter = None
+    if origin not in (Union, types.UnionType) and origin is not Literal:
+        converter = _TYPE_DISPATCH.get(inner_type) or _TYPE_DISPATCH.get(origin)
+
+    if converter is None:
+        return lambda param_name, value: validate_parameter(param_name, value, expected_type)
+
+    # The class a converter passes through unchanged (list for list[str])
+    exact_type = origin if origin is not None else inner_type
+
+    def validate(param_name: str, value: Any) -> Any:
+        if type(value) is exact_type:
+            return value
+        if value is None:
+            if is_optional:
+                return None
+            raise ValueError(f"Parameter '{param_name}' cannot be None")
+        return converter(param_name, value)
+
+    return validate
+
+
 def validate_params(func: F) -> F:
     """Decorator to validate function parameters based on type hints."""
     sig = inspect.signature(func)
     type_hints = get_type_hints(func)
 
+    # Everything the wrapper needs is resolved here, once, so a call does not
+    # go through signature binding or type-hint lookups per parameter
+    parameters = sig.parameters
+    schema = tuple(
+        (name, _parameter_validator(type_hints[name]))
+        for name in parameters if name in type_hints
+    )
+    defaults = {
+        name: param.default
+        for name, param in parameters.items()
+        if param.default is not inspect.Parameter.empty
+    }
+    param_names = frozenset(parameters)
+    required_names = param_names - defaults.keys()
+    # MCP invokes tools with keyword arguments only; that case is bound by a
+    # dict merge. Anything else (positional args, *args/**kwargs signatures,
+    # missing or unknown names) falls back to sig.bind and its TypeErrors.
+    keyword_fast_path = all(
+        param.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        for param in parameters.values()
+    )
+
     @functools.wraps(func)
     async def wrapper(*args: Any, **kwargs: Any) -> Any:
         # Combine args and kwargs based on function signature
-        bound_args = sig.bind(*args, **kwargs)
-        bound_args.apply_defaults()
+        if keyword_fast_path and not args and required_names <= kwargs.keys() <= param_names:
+            # **kwargs is always a fresh dict, so validate it in place and
+            # only fill in the defaults the caller left out
+            arguments = kwargs
+            if len(arguments) < len(param_names):
+                for name, default in defaults.items():
+                    arguments.setdefault(name, default)
+        else:
+            bound_args = sig.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            arguments = bound_args.arguments
 
         # Validate each parameter
-        for param_name, param_value in bound_args.arguments.items():
-            if param_name in type_hints:
-                expected_type = type_hints[param_name]
-                try:
-                    # Skip return type annotation
-                    if param_name != "return":
-                        bound_args.arguments[param_name] = validate_parameter(param_name, param_value, expected_type)
-                except ValueError as e:
-                    # Return error as JSON response
-                    error_message = str(e)
-                    log_error(f"Parameter validation error: {error_message}", param_name=param_name, value=param_value)
-                    return json.dumps({"error": error_message})
+        for param_name, validate in schema:
+            param_value = arguments[param_name]
+            try:
+                arguments[param_name] = validate(param_name, param_value)
+            except ValueError as e:
+                # Return error as JSON response
+                error_message = str(e)
+                log_error(f"Parameter validation error: {error_message}", param_name=param_name, value=param_value)
+                return json.dumps({"error": error_message})
 
         # Call the original function with validated parameters
-        return await func(**bound_args.arguments)
+        return await func(**arguments)
 
     return cast(F, wrapper)
 
@@ -1,5 +1,6 @@
 """MCP resources and prompts for Canvas integration."""
 
+import asyncio
 from pathlib import Path
 
 from fastmcp import FastMCP
@@ -68,15 +69,17 @@ def register_resources_and_prompts(mcp: FastMCP) -> None:
         """Generate a summary of a Canvas course."""
         course_id = await get_course_id(course_identifier)
 
-        # Get course details
-        course_response = await make_canvas_request("get", f"/courses/{course_id}")
+        # Course details, assignments and modules are independent; fetch them
+        # concurrently so the summary waits for the slowest one, not all three
+        course_response, assignments_response, modules_response = await asyncio.gather(
+            make_canvas_request("get", f"/courses/{course_id}"),
+            fetch_all_paginated_results(f"/courses/{course_id}/assignments"),
+            fetch_all_paginated_results(f"/courses/{course_id}/modules"),
+        )
 
         if "error" in course_response:
             return f"Error fetching course: {course_response['error']}"
 
-        # Get assignments
-        assignments_response = await fetch_all_paginated_results(f"/courses/{course_id}/assignments")
-
         if isinstance(assignments_response, dict) and "error" in assignments_response:
             assignments_info = "Error fetching assignments"
         else:
@@ -90,9 +93,6 @@ def register_resources_and_prompts(mcp: FastMCP) -> None:
             upcoming_count = len(upcoming_assignments)
             assignments_info = f"{assignments_count} total assignments, {upcoming_count} upcoming"
 
-        # Get modules
-        modules_response = await fetch_all_paginated_results(f"/courses/{course_id}/modules")
-
         if isinstance(modules_response, dict) and "error" in modules_response:
             modules_info = "Error fetching modules"
         else:
@@ -141,8 +141,9 @@ def register_admin_tools(mcp: FastMCP) -> None:
 
             # Get enrollment info
             enrollments = user.get("enrollments", [])
-            roles = [enrollment.get("role", "Student") for enrollment in enrollments]
-            role_list = ", ".join(set(roles)) if roles else "Student"
+            # dict.fromkeys de-duplicates while keeping Canvas's enrollment order
+            roles = dict.fromkeys(enrollment.get("role", "Student") for enrollment in enrollments)
+            role_list = ", ".join(roles) if roles else "Student"
 
             users_info.append(
                 f"ID: {user_id}\nName: {name}\nEmail: {email}\nRoles: {role_list}\n"
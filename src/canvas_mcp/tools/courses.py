@@ -95,6 +95,74 @@ def format_media_inventory(media: list[dict[str, str]]) -> str:
     return "\n".join(lines)
 
 
+# strip_html_tags: <script>/<style> openers and their closing tags
+_SCRIPT_STYLE_START_RE = re.compile(r'<(script|style)\b', re.IGNORECASE)
+_SCRIPT_STYLE_CLOSE_RES = {
+    "script": re.compile(r'</script>', re.IGNORECASE),
+    "style": re.compile(r'</style>', re.IGNORECASE),
+}
+
+
+def _drop_script_style_blocks(text: str) -> str:
+    """Remove <script>/<style> blocks, including their contents, in linear time.
+
+    Equivalent to ``re.sub(r'(?is)<(script|style)\\b[^>]*>.*?</\\1>', '', text)``,
+    but that lazy pattern rescans to the end of the input for every unclosed
+    opener, which is quadratic on attacker-supplied HTML. Once no '>' follows an
+    opener, or no closing tag of a kind follows one, no later opener can match
+    either, so each of those searches is done at most once.
+    """
+    parts: list[str] = []
+    copied_to = search_from = 0
+    unclosed: set[str] = set()
+    while len(unclosed) < len(_SCRIPT_STYLE_CLOSE_RES):
+        start = _SCRIPT_STYLE_START_RE.search(text, search_from)
+        if start is None:
+            break
+        kind = start.group(1).lower()
+        if kind not in unclosed:
+            opener_end = text.find(">", start.end())
+            if opener_end < 0:
+                break
+            close = _SCRIPT_STYLE_CLOSE_RES[kind].search(text, opener_end + 1)
+            if close is not None:
+                parts.append(text[copied_to:start.start()])
+                copied_to = search_from = close.end()
+                continue
+            unclosed.add(kind)
+        search_from = start.start() + 1
+    parts.append(text[copied_to:])
+    return "".join(parts)
+
+
+# strip_html_tags: <br> and closing block-level tags become line breaks,
+# closing cells become tabs. None of these can contain '<' or '>', so their
+# matches never overlap and one alternation equals three sequential passes.
+_HTML_BOUNDARY_TAG_RE = re.compile(
+    r'(?P<br><\s*br\s*/?\s*>)'
+    r'|(?P<block></\s*(?:p|div|h[1-6]|li|ul|ol|tr|table|thead|tbody|tfoot|'
+    r'section|article|header|footer|blockquote|pre)\s*>)'
+    r'|(?P<cell></\s*(?:td|th)\s*>)',
+    re.IGNORECASE,
+)
+_HTML_BOUNDARY_REPLACEMENTS = {"br": "\n", "block": "\n", "cell": "\t"}
+# strip_html_tags: any other tag
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _replace_boundary_tag(match: re.Match[str]) -> str:
+    return _HTML_BOUNDARY_REPLACEMENTS[match.lastgroup or ""]
+
+
+# strip_html_tags: a whitespace run, with or without line breaks
+_WHITESPACE_RUN_RE = re.compile(r'[ \t\xa0]*(?:\n[ \t\xa0]*)+|[ \t\xa0]+')
+
+
+def _collapse_whitespace_run(match: re.Match[str]) -> str:
+    newlines = match.group().count("\n")
+    return "\n" * min(newlines, 2) if newlines else " "
+
+
 def strip_html_tags(html_content: str) -> str:
     """Convert HTML to readable plain text.
 
@@ -112,33 +180,27 @@ def strip_html_tags(html_content: str) -> str:
 
     # Drop <script>/<style> blocks entirely so their JS/CSS contents don't
     # leak into the plain-text output.
-    text = re.sub(r'(?is)<(script|style)\b[^>]*>.*?</\1>', '', text)
+    text = _drop_script_style_blocks(text)
 
     # Normalize <br> and block-level boundaries to newlines so content across
-    # tag boundaries is separated instead of concatenated.
-    text = re.sub(r'(?i)<\s*br\s*/?\s*>', '\n', text)
-    text = re.sub(
-        r'(?i)</\s*(?:p|div|h[1-6]|li|ul|ol|tr|table|thead|tbody|tfoot|'
-        r'section|article|header|footer|blockquote|pre)\s*>',
-        '\n',
-        text,
-    )
-    # Separate table cells within a row.
-    text = re.sub(r'(?i)</\s*(?:td|th)\s*>', '\t', text)
+    # tag boundaries is separated instead of concatenated, and separate table
+    # cells within a row.
+    text = _HTML_BOUNDARY_TAG_RE.sub(_replace_boundary_tag, text)
 
     # Remove all remaining tags. Use a space so inline tags don't join words.
-    text = re.sub(r'<[^>]+>', ' ', text)
+    # Kept as a separate, later pass: a literal '<' in the text can pair with
+    # a '>' past a boundary tag, and that must see the tag already replaced.
+    text = _HTML_TAG_RE.sub(' ', text)
 
     # Decode HTML entities (named, decimal, and hex) via the stdlib — covers
     # smart quotes, dashes, accents, &nbsp;, etc. that Canvas content commonly
     # uses, with no manual entity table to maintain.
     text = html.unescape(text)
 
-    # Collapse intra-line whitespace but preserve line breaks. \xa0 (decoded
-    # from &nbsp;) is normalized to a regular space.
-    text = re.sub(r'[ \t\xa0]+', ' ', text)
-    text = re.sub(r' *\n *', '\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    # Collapse intra-line whitespace but preserve line breaks, in one scan:
+    # a run without a newline becomes one space, a run with newlines keeps
+    # at most one blank line. \xa0 (decoded from &nbsp;) counts as a space.
+    text = _WHITESPACE_RUN_RE.sub(_collapse_whitespace_run, text)
 
     return text.strip()
 
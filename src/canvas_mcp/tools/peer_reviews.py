@@ -152,11 +152,13 @@ def register_peer_review_tools(mcp: FastMCP) -> None:
                     except Exception as save_error:
                         result["save_error"] = f"Failed to save file: {str(save_error)}"
 
-            if report_format in ["csv", "markdown"]:
-                report: str = result.get("report", json.dumps(result, indent=2))
-                return report
-            else:
-                return json.dumps(result, indent=2)
+            report: str = result.get("report", json.dumps(result, indent=2))
+            # The report string does not carry the save outcome, so report it
+            if "saved_to" in result:
+                report += f"\n\nSaved to: {result['saved_to']}"
+            elif "save_error" in result:
+                report += f"\n\nSave failed: {result['save_error']}"
+            return report
 
         except Exception as e:
             return f"Error in generate_peer_review_report: {str(e)}"
@@ -0,0 +1,83 @@
+"""Unit tests for the course code <-> id cache."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import canvas_mcp.core.cache as cache_module
+from canvas_mcp.core.cache import get_course_code, get_course_id, reset_course_cache
+
+COURSES = [{"id": 101, "course_code": "badm_350_120251"}]
+
+
+@pytest.fixture(autouse=True)
+def clean_course_cache():
+    reset_course_cache()
+    with patch.object(cache_module, "get_config", return_value=SimpleNamespace(cache_ttl=300)):
+        yield
+    reset_course_cache()
+
+
+class TestGetCourseId:
+    @pytest.mark.asyncio
+    async def test_numeric_and_sis_ids_skip_the_api(self):
+        with patch.object(cache_module, "fetch_all_paginated_results", new=AsyncMock()) as fetch:
+            assert await get_course_id("101") == "101"
+            assert await get_course_id("sis_course_id:abc") == "sis_course_id:abc"
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_course_code_resolves_from_one_refresh(self):
+        with patch.object(
+            cache_module, "fetch_all_paginated_results", new=AsyncMock(return_value=COURSES)
+        ) as fetch:
+            assert await get_course_id("badm_350_120251") == "101"
+            assert await get_course_id("badm_350_120251") == "101"
+            assert await get_course_code("101") == "badm_350_120251"
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_refresh(self):
+        async def slow_fetch(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return COURSES
+
+        with patch.object(
+            cache_module, "fetch_all_paginated_results", new=AsyncMock(side_effect=slow_fetch)
+        ) as fetch:
+            results = await asyncio.gather(*(get_course_id("badm_350_120251") for _ in range(5)))
+        assert results == ["101"] * 5
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_not_refetched_within_ttl(self):
+        with patch.object(
+            cache_module, "fetch_all_paginated_results", new=AsyncMock(return_value=[])
+        ) as fetch:
+            assert await get_course_id("unknown_code") == "sis_course_id:unknown_code"
+            assert await get_course_id("other_code") == "sis_course_id:other_code"
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_retried_on_next_miss(self):
+        with patch.object(
+            cache_module,
+            "fetch_all_paginated_results",
+            new=AsyncMock(side_effect=[{"error": "boom"}, COURSES]),
+        ) as fetch:
+            assert await get_course_id("badm_350_120251") == "sis_course_id:badm_350_120251"
+            assert await get_course_id("badm_350_120251") == "101"
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_refetched_after_ttl(self):
+        with patch.object(
+            cache_module, "get_config", return_value=SimpleNamespace(cache_ttl=0)
+        ), patch.object(
+            cache_module, "fetch_all_paginated_results", new=AsyncMock(side_effect=[[], COURSES])
+        ) as fetch:
+            assert await get_course_id("badm_350_120251") == "sis_course_id:badm_350_120251"
+            assert await get_course_id("badm_350_120251") == "101"
+        assert fetch.await_count == 2
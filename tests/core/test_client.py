@@ -51,6 +51,44 @@ class TestResolveCanvasApiRoot:
             )
 
 
+class TestRetryAfterSeconds:
+    def test_delta_seconds(self):
+        assert client_module._retry_after_seconds("7", attempt=0) == 7
+
+    def test_http_date(self):
+        with patch.object(client_module.time, "time", return_value=784111767.0):
+            wait = client_module._retry_after_seconds(
+                "Sun, 06 Nov 1994 08:49:37 GMT", attempt=0
+            )
+        assert wait == 10
+
+    def test_http_date_in_the_past_waits_zero(self):
+        assert client_module._retry_after_seconds(
+            "Sun, 06 Nov 1994 08:49:37 GMT", attempt=0
+        ) == 0
+
+    def test_far_future_http_date_is_capped(self):
+        assert client_module._retry_after_seconds(
+            "Fri, 31 Dec 9999 23:59:59 GMT", attempt=0
+        ) == client_module.MAX_RETRY_AFTER_SECONDS
+
+    def test_out_of_range_http_date_falls_back_to_backoff(self):
+        assert client_module._retry_after_seconds(
+            "Mon, 01 Jan 99999999999 00:00:00 GMT", attempt=1
+        ) == client_module.INITIAL_BACKOFF_SECONDS * 2
+
+    def test_large_delta_seconds_is_capped(self):
+        assert client_module._retry_after_seconds("86400", attempt=0) == (
+            client_module.MAX_RETRY_AFTER_SECONDS
+        )
+
+    @pytest.mark.parametrize("header", [None, "", "soon", "-5", "1.5", "\u00b2", "\u0663"])
+    def test_unusable_header_falls_back_to_backoff(self, header):
+        assert client_module._retry_after_seconds(header, attempt=2) == (
+            client_module.INITIAL_BACKOFF_SECONDS * 4
+        )
+
+
 class TestMakeCanvasRequestApiRoot:
     @pytest.fixture(autouse=True)
     def reset_client_state(self):
@@ -0,0 +1,432 @@
+"""Tests for canvas_mcp.core.peer_review_comments.
+
+Exercises the analyzer directly (the tool-level tests in
+tests/tools/test_peer_review_comments.py mock it out entirely).
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from canvas_mcp.core.anonymization import clear_anonymization_cache
+from canvas_mcp.core.peer_review_comments import PeerReviewCommentAnalyzer
+
+
+def _review(review_id: str, text: str) -> dict:
+    return {
+        "review_id": review_id,
+        "reviewer": {"student_id": 1, "anonymous_id": "Reviewer_a"},
+        "reviewee": {"student_id": 2, "anonymous_id": "Reviewee_b"},
+        "review_content": {
+            "comment_text": text,
+            "word_count": len(text.split()),
+            "character_count": len(text),
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_anonymization_cache():
+    # generate_anonymous_id caches by real ID regardless of prefix, so
+    # Reviewer_/Student_ IDs minted here would leak into later tests.
+    clear_anonymization_cache()
+    yield
+    clear_anonymization_cache()
+
+
+@pytest.fixture
+def analyzer_with_reviews():
+    def _make(*texts: str) -> PeerReviewCommentAnalyzer:
+        analyzer = PeerReviewCommentAnalyzer()
+        reviews = [_review(f"review_{i}", t) for i, t in enumerate(texts)]
+        analyzer.get_peer_review_comments = AsyncMock(
+            return_value={"peer_reviews": reviews}
+        )
+        return analyzer
+    return _make
+
+
+@pytest.mark.asyncio
+async def test_analyze_quality_aggregates(analyzer_with_reviews):
+    analyzer = analyzer_with_reviews(
+        "Good job",
+        "I suggest you consider renaming the variable on line 12 so the "
+        "function logic is easier to follow for readers?",
+        "This is wrong and bad",
+    )
+
+    result = await analyzer.analyze_peer_review_quality(1, 10)
+
+    overall = result["overall_analysis"]
+    assert overall["total_reviews_analyzed"] == 3
+    assert sum(overall["quality_distribution"].values()) == 3
+
+    constructiveness = result["detailed_metrics"]["constructiveness_analysis"]
+    assert constructiveness["constructive_feedback_count"] == 1
+    assert constructiveness["generic_comments"] == 1
+    assert constructiveness["specific_suggestions"] == 1
+
+    sentiment = result["detailed_metrics"]["sentiment_analysis"]
+    assert sentiment["positive_sentiment"] == 0.33
+    assert sentiment["negative_sentiment"] == 0.33
+    assert sentiment["neutral_sentiment"] == 0.33
+
+    flagged_ids = {r["review_id"] for r in result["flagged_reviews"]}
+    assert "review_0" in flagged_ids
+    assert "review_2" in flagged_ids
+
+
+@pytest.mark.asyncio
+async def test_analyze_quality_single_review_std_dev_is_float(analyzer_with_reviews):
+    result = await analyzer_with_reviews("Good job").analyze_peer_review_quality(1, 10)
+
+    std_dev = result["detailed_metrics"]["word_count_stats"]["std_dev"]
+    assert std_dev == 0.0 and isinstance(std_dev, float)
+@pytest.mark.asyncio
+async def test_analyze_quality_no_reviews(analyzer_with_reviews):
+    analyzer = analyzer_with_reviews()
+    result = await analyzer.analyze_peer_review_quality(1, 10)
+    assert result == {"error": "No peer reviews found for analysis"}
+
+
+@pytest.mark.asyncio
+async def test_analyze_quality_propagates_fetch_error():
+    analyzer = PeerReviewCommentAnalyzer()
+    with patch.object(
+        analyzer, "get_peer_review_comments",
+        AsyncMock(return_value={"error": "boom"}),
+    ):
+        result = await analyzer.analyze_peer_review_quality(1, 10)
+    assert result == {"error": "boom"}
+
+
+@pytest.mark.asyncio
+async def test_identify_problematic_flag_summary(analyzer_with_reviews):
+    analyzer = analyzer_with_reviews(
+        "Good job",
+        "Looks good, this is terrible",
+        "I suggest you consider renaming the variable on line 12 so the "
+        "function logic is easier to follow for readers",
+    )
+
+    result = await analyzer.identify_problematic_peer_reviews(1, 10)
+
+    assert result["total_reviews_analyzed"] == 3
+    assert result["total_flagged"] == 2
+    assert result["flag_summary"]["too_short"] == 2
+    assert result["flag_summary"]["generic_language"] == 2
+    assert result["flag_summary"]["potentially_harsh"] == 1
+    assert sum(
+        len(r["flags"]) for r in result["flagged_reviews"]
+    ) == sum(result["flag_summary"].values())
+
+
+@pytest.mark.asyncio
+async def test_identify_problematic_custom_generic_phrases(analyzer_with_reviews):
+    analyzer = analyzer_with_reviews("Good job (really)", "meh.")
+
+    none_result = await analyzer.identify_problematic_peer_reviews(
+        1, 10, criteria={"generic_phrases": []}
+    )
+    assert "generic_language" not in none_result["flag_summary"]
+
+    custom_result = await analyzer.identify_problematic_peer_reviews(
+        1, 10, criteria={"generic_phrases": ["(really)", "meh"]}
+    )
+    assert custom_result["flag_summary"]["generic_language"] == 2
+
+
+@pytest.mark.asyncio
+async def test_precomputed_quality_score_is_reused(analyzer_with_reviews):
+    analyzer = analyzer_with_reviews("Good job")
+    reviews = analyzer.get_peer_review_comments.return_value["peer_reviews"]
+    reviews[0]["review_content"]["quality_score"] = 4.5
+
+    with patch.object(analyzer, "_calculate_quality_score") as scorer:
+        result = await analyzer.analyze_peer_review_quality(1, 10)
+
+    scorer.assert_not_called()
+    assert result["overall_analysis"]["average_quality_score"] == 4.5
+
+
+@pytest.mark.asyncio
+async def test_identify_problematic_flags_near_duplicates(analyzer_with_reviews):
+    pasted = (
+        "The introduction explains the problem well but the analysis section "
+        "needs more evidence from the dataset to support each claim you make"
+    )
+    analyzer = analyzer_with_reviews(
+        pasted,
+        pasted.upper().replace("you make", "you make."),
+        pasted + " overall",
+        "Your chart labels overlap on the second figure so consider rotating "
+        "them and adding a legend that explains the colour scheme",
+    )
+
+    result = await analyzer.identify_problematic_peer_reviews(
+        1, 10, criteria={"duplicate_max_distance": 6}
+    )
+
+    flagged = {
+        r["review_id"]: r["flags"] for r in result["flagged_reviews"]
+    }
+    for review_id in ("review_0", "review_1", "review_2"):
+        assert "possible_duplicate" in flagged[review_id]
+    assert "possible_duplicate" not in flagged.get("review_3", [])
+    assert result["flag_summary"]["possible_duplicate"] == 3
+
+
+def test_simhash_skips_short_comments():
+    from canvas_mcp.core.peer_review_comments import _find_near_duplicates, _simhash
+
+    assert _simhash("Good job") is None
+    assert _find_near_duplicates([None, None, _simhash("a b c d")], 3) == set()
+
+
+def test_preview_truncates_long_comments():
+    from canvas_mcp.core.peer_review_comments import _preview
+
+    assert _preview("short") == "short"
+    assert _preview("x" * 100) == "x" * 100
+    assert _preview("x" * 101) == "x" * 100 + "..."
+
+
+# ---------------------------------------------------------------------------
+# get_peer_review_comments
+# ---------------------------------------------------------------------------
+
+MODULE = "canvas_mcp.core.peer_review_comments"
+
+PEER_REVIEWS = [
+    {"id": 1, "assessor_id": 101, "user_id": 201, "asset_id": 9001},
+    {"id": 2, "assessor_id": 102, "user_id": 201, "asset_id": 9001},
+    {"id": 3, "assessor_id": 201, "user_id": 101, "asset_id": 9002},
+]
+
+SUBMISSIONS = [
+    {
+        "id": 9001, "user_id": 201, "submitted_at": None,
+        "submission_comments": [
+            {"author_id": 101, "comment": "Consider adding tests", "created_at": None},
+            {"author_id": 102, "comment": "", "created_at": None},
+        ],
+    },
+    {
+        "id": 9002, "user_id": 101, "submitted_at": None,
+        "submission_comments": [],
+    },
+]
+
+USERS = [
+    {"id": 101, "name": "Ada"},
+    {"id": 102, "name": "Grace"},
+    {"id": 201, "name": "Linus"},
+]
+
+
+@pytest.fixture
+def mock_comment_api():
+    async def fake_fetch(endpoint, params=None, **kwargs):
+        if endpoint.endswith("/users"):
+            return USERS
+        wanted = set(params["student_ids[]"])
+        return [s for s in SUBMISSIONS if s["user_id"] in wanted]
+
+    async def fake_request(method, endpoint, **kwargs):
+        if endpoint.endswith("/peer_reviews"):
+            return PEER_REVIEWS
+        return {"id": 10, "name": "Essay 1"}
+
+    with patch(f"{MODULE}.make_canvas_request", side_effect=fake_request) as req, \
+         patch(f"{MODULE}.fetch_all_paginated_results", side_effect=fake_fetch) as fetch:
+        yield {"make_canvas_request": req, "fetch_all_paginated_results": fetch}
+
+
+@pytest.mark.asyncio
+async def test_get_comments_fetches_only_reviewed_submissions(mock_comment_api):
+    analyzer = PeerReviewCommentAnalyzer()
+    result = await analyzer.get_peer_review_comments(1, 10)
+
+    submission_calls = [
+        c for c in mock_comment_api["fetch_all_paginated_results"].call_args_list
+        if "submissions" in c.args[0]
+    ]
+    assert len(submission_calls) == 1
+    assert submission_calls[0].args[0] == "/courses/1/students/submissions"
+    assert submission_calls[0].args[1]["student_ids[]"] == [101, 201]
+    assert submission_calls[0].args[1]["assignment_ids[]"] == [10]
+
+    summary = result["summary_statistics"]
+    assert summary["total_comments"] == 3
+    assert summary["comments_with_text"] == 1
+    assert summary["empty_comments"] == 2
+
+    first = result["peer_reviews"][0]
+    assert first["review_content"]["comment_text"] == "Consider adding tests"
+    assert first["reviewer"]["student_name"] == "Ada"
+    assert first["reviewee"]["student_name"] == "Linus"
+
+
+@pytest.mark.asyncio
+async def test_get_comments_batches_submission_requests(mock_comment_api):
+    with patch(f"{MODULE}.SUBMISSION_BATCH_SIZE", 1):
+        await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+
+    submission_calls = [
+        c for c in mock_comment_api["fetch_all_paginated_results"].call_args_list
+        if "submissions" in c.args[0]
+    ]
+    assert [c.args[1]["student_ids[]"] for c in submission_calls] == [[101], [201]]
+
+
+def test_running_stats_matches_statistics_module():
+    import statistics
+
+    from canvas_mcp.core.peer_review_comments import _RunningStats
+
+    values = [3, 17, 0, 42, 8, 8, 25]
+    stats = _RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.stdev == pytest.approx(statistics.stdev(values))
+    assert (stats.min, stats.max) == (0, 42)
+
+    single = _RunningStats()
+    single.add(5)
+    assert single.stdev == 0.0
+
+
+@pytest.mark.asyncio
+async def test_get_comments_resolves_each_identity_once(mock_comment_api):
+    with patch(
+        f"{MODULE}.generate_anonymous_id", side_effect=lambda i, p: f"{p}_{i}"
+    ) as anon:
+        result = await PeerReviewCommentAnalyzer().get_peer_review_comments(
+            1, 10, anonymize_students=True
+        )
+
+    # Six participant slots but five distinct (student, role) pairs, since
+    # 201 is reviewee twice; each pair costs a name + role ID lookup
+    assert anon.call_count == 2 * 5
+    reviewees = [r["reviewee"] for r in result["peer_reviews"]]
+    assert reviewees[0] == reviewees[1]
+    assert reviewees[0] is not reviewees[1]
+    assert reviewees[0]["student_name"] == "Student_201"
+    assert reviewees[0]["anonymous_id"] == "Reviewee_201"
+
+
+@pytest.mark.asyncio
+async def test_get_comments_uses_first_comment_per_reviewer(mock_comment_api):
+    submission = {
+        "id": 9001, "user_id": 201, "submitted_at": None,
+        "submission_comments": [
+            {"author_id": 999, "comment": "Instructor note", "created_at": None},
+            {"author_id": 101, "comment": "First pass", "created_at": None},
+            {"author_id": 101, "comment": "Follow-up", "created_at": None},
+        ],
+    }
+    mock_comment_api["fetch_all_paginated_results"].side_effect = (
+        lambda endpoint, params=None, **kw: USERS if endpoint.endswith("/users") else [submission]
+    )
+
+    result = await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+
+    texts = [r["review_content"]["comment_text"] for r in result["peer_reviews"]]
+    assert texts == ["First pass", "", ""]
+
+
+def _users_calls(mock_comment_api):
+    return [
+        c for c in mock_comment_api["fetch_all_paginated_results"].call_args_list
+        if c.args[0].endswith("/users")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_comments_uses_embedded_names_when_not_anonymizing(
+    mock_comment_api, monkeypatch
+):
+    monkeypatch.setenv("ENABLE_DATA_ANONYMIZATION", "false")
+    embedded = [
+        {**pr,
+         "assessor": {"id": pr["assessor_id"], "display_name": f"Embedded {pr['assessor_id']}"},
+         "user": {"id": pr["user_id"], "display_name": f"Embedded {pr['user_id']}"}}
+        for pr in PEER_REVIEWS
+    ]
+    mock_comment_api["make_canvas_request"].side_effect = (
+        lambda method, endpoint, **kw: embedded if endpoint.endswith("/peer_reviews")
+        else {"id": 10, "name": "Essay 1"}
+    )
+
+    result = await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+
+    assert _users_calls(mock_comment_api) == []
+    assert result["peer_reviews"][0]["reviewer"]["student_name"] == "Embedded 101"
+
+
+@pytest.mark.asyncio
+async def test_get_comments_fetches_only_missing_users(mock_comment_api, monkeypatch):
+    monkeypatch.setenv("ENABLE_DATA_ANONYMIZATION", "false")
+    partial = [dict(pr) for pr in PEER_REVIEWS]
+    partial[0]["assessor"] = {"id": 101, "display_name": "Embedded Ada"}
+    partial[0]["user"] = {"id": 201, "display_name": "Embedded Linus"}
+    mock_comment_api["make_canvas_request"].side_effect = (
+        lambda method, endpoint, **kw: partial if endpoint.endswith("/peer_reviews")
+        else {"id": 10, "name": "Essay 1"}
+    )
+
+    result = await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+
+    (users_call,) = _users_calls(mock_comment_api)
+    assert users_call.args[1]["user_ids[]"] == [102]
+    assert result["peer_reviews"][1]["reviewer"]["student_name"] == "Grace"
+
+
+@pytest.mark.asyncio
+async def test_get_comments_ignores_embedded_names_when_anonymizing(
+    mock_comment_api, monkeypatch
+):
+    monkeypatch.setenv("ENABLE_DATA_ANONYMIZATION", "true")
+    leaky = [
+        {**pr, "assessor": {"display_name": "Real Name"}, "user": {"display_name": "Real Name"}}
+        for pr in PEER_REVIEWS
+    ]
+    mock_comment_api["make_canvas_request"].side_effect = (
+        lambda method, endpoint, **kw: leaky if endpoint.endswith("/peer_reviews")
+        else {"id": 10, "name": "Essay 1"}
+    )
+
+    result = await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+
+    (users_call,) = _users_calls(mock_comment_api)
+    assert "user_ids[]" not in users_call.args[1]
+    assert "Real Name" not in str(result)
+
+
+@pytest.mark.asyncio
+async def test_get_comments_submission_context(mock_comment_api):
+    result = await PeerReviewCommentAnalyzer().get_peer_review_comments(
+        1, 10, include_submission_context=True
+    )
+
+    infos = [r["submission_info"] for r in result["peer_reviews"]]
+    assert infos[0] == {"submission_id": 9001, "submitted_at": "N/A", "attempt": 1}
+    assert infos[0] == infos[1] and infos[0] is not infos[1]
+    assert infos[2]["submission_id"] == 9002
+
+    plain = await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+    assert "submission_info" not in plain["peer_reviews"][0]
+
+
+@pytest.mark.asyncio
+async def test_get_comments_scores_quality_only_on_request(mock_comment_api):
+    plain = await PeerReviewCommentAnalyzer().get_peer_review_comments(1, 10)
+    assert all("quality_score" not in r["review_content"] for r in plain["peer_reviews"])
+
+    scored = await PeerReviewCommentAnalyzer().get_peer_review_comments(
+        1, 10, score_quality=True
+    )
+    assert all("quality_score" in r["review_content"] for r in scored["peer_reviews"])
@@ -0,0 +1,427 @@
+"""Tests for canvas_mcp.core.peer_reviews.
+
+Exercises PeerReviewAnalyzer against mocked Canvas responses; the tool-level
+wrappers in tools/peer_reviews.py only forward to it.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from canvas_mcp.core.peer_reviews import PeerReviewAnalyzer, reset_analytics_cache
+
+MODULE = "canvas_mcp.core.peer_reviews"
+
+ASSIGNMENT = {
+    "id": 10,
+    "name": "Essay 1",
+    "anonymous_peer_reviews": False,
+    "automatic_peer_reviews": True,
+    "peer_review_count": 2,
+}
+
+PEER_REVIEWS = [
+    {"id": 1, "assessor_id": 101, "user_id": 201, "workflow_state": "completed",
+     "created_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-02T00:00:00Z"},
+    {"id": 2, "assessor_id": 101, "user_id": 202, "workflow_state": "assigned",
+     "created_at": "2026-01-01T00:00:00Z"},
+    {"id": 3, "assessor_id": 102, "user_id": 201, "workflow_state": "assigned",
+     "created_at": "2026-01-01T00:00:00Z"},
+    {"id": 4, "assessor_id": 201, "user_id": 101, "workflow_state": "completed",
+     "created_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-03T00:00:00Z"},
+]
+
+USERS = [
+    {"id": 101, "name": "Ada"},
+    {"id": 102, "name": "Grace"},
+    {"id": 201, "name": "Linus"},
+    {"id": 202, "name": "Barbara"},
+    {"id": 203, "name": "Edsger"},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    reset_analytics_cache()
+    yield
+    reset_analytics_cache()
+
+
+@pytest.fixture
+def mock_canvas():
+    async def fake_request(method, endpoint, **kwargs):
+        if endpoint.endswith("/peer_reviews"):
+            return PEER_REVIEWS
+        return ASSIGNMENT
+
+    async def fake_fetch(endpoint, params=None, **kwargs):
+        return USERS
+
+    with patch(f"{MODULE}.make_canvas_request", side_effect=fake_request) as req, \
+         patch(f"{MODULE}.fetch_all_paginated_results", side_effect=fake_fetch) as fetch:
+        yield {"make_canvas_request": req, "fetch_all_paginated_results": fetch}
+
+
+# ---------------------------------------------------------------------------
+# get_assignments
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_get_assignments_maps_reviewers(mock_canvas):
+    result = await PeerReviewAnalyzer().get_assignments(1, 10)
+
+    assert result["assignment_info"]["name"] == "Essay 1"
+    assert result["assignment_info"]["total_reviews_assigned"] == 4
+    first = result["assignments"][0]
+    assert first["reviewer_name"] == "Ada"
+    assert first["reviewee_name"] == "Linus"
+    assert first["status"] == "completed"
+    assert mock_canvas["make_canvas_request"].call_count == 2
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_assignments_skips_roster_without_names(mock_canvas):
+    result = await PeerReviewAnalyzer().get_assignments(1, 10, include_names=False)
+
+    assert "reviewer_name" not in result["assignments"][0]
+    mock_canvas["fetch_all_paginated_results"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_assignments_reports_peer_review_error(mock_canvas):
+    async def failing(method, endpoint, **kwargs):
+        if endpoint.endswith("/peer_reviews"):
+            return {"error": "forbidden"}
+        return ASSIGNMENT
+
+    mock_canvas["make_canvas_request"].side_effect = failing
+    result = await PeerReviewAnalyzer().get_assignments(1, 10)
+
+    assert result == {"error": "Failed to get peer reviews: forbidden"}
+
+
+@pytest.mark.asyncio
+async def test_get_assignments_wraps_request_exception(mock_canvas):
+    mock_canvas["fetch_all_paginated_results"].side_effect = RuntimeError("boom")
+    result = await PeerReviewAnalyzer().get_assignments(1, 10)
+
+    assert result == {"error": "Exception in get_assignments: boom"}
+
+
+# ---------------------------------------------------------------------------
+# get_completion_analytics
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_completion_analytics_summary(mock_canvas):
+    result = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    summary = result["summary"]
+    assert summary["total_students_enrolled"] == 5
+    assert summary["students_with_submissions"] == 3
+    assert summary["total_reviews_assigned"] == 4
+    assert summary["reviews_completed"] == 2
+    assert summary["completion_rate_percent"] == 50.0
+    assert summary["students_all_complete"] == 1
+    assert summary["students_partial_complete"] == 1
+    assert summary["students_none_complete"] == 1
+
+    groups = result["completion_groups"]
+    assert [s["student_name"] for s in groups["partial_complete"]] == ["Ada"]
+    assert groups["partial_complete"][0]["pending_reviews"][0]["reviewee_name"] == "Barbara"
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_without_grouping(mock_canvas):
+    result = await PeerReviewAnalyzer().get_completion_analytics(
+        1, 10, group_by_status=False
+    )
+
+    assert result["completion_groups"] == {
+        "all_complete": [], "partial_complete": [], "none_complete": []
+    }
+    summary = result["summary"]
+    assert summary["students_all_complete"] == 1
+    assert summary["students_partial_complete"] == 1
+    assert summary["students_none_complete"] == 1
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_summary_only(mock_canvas):
+    result = await PeerReviewAnalyzer().get_completion_analytics(
+        1, 10, include_student_details=False
+    )
+
+    assert "completion_groups" not in result
+    assert result["summary"]["students_partial_complete"] == 1
+    assert result["summary"]["students_none_complete"] == 1
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_fetches_roster_once(mock_canvas):
+    await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_roster_page_size_stays_at_canvas_maximum(mock_canvas):
+    await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    params = mock_canvas["fetch_all_paginated_results"].call_args.args[1]
+    assert params["per_page"] == 100
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_roster_error(mock_canvas):
+    mock_canvas["fetch_all_paginated_results"].side_effect = None
+    mock_canvas["fetch_all_paginated_results"].return_value = {"error": "denied"}
+
+    result = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert "Failed to get users" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_includes_assignment_info(mock_canvas):
+    result = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert result["assignment_info"]["id"] == 10
+    assert result["assignment_info"]["peer_review_settings"]["reviews_per_student"] == 2
+
+
+# ---------------------------------------------------------------------------
+# generate_report / get_followup_list
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("report_format", ["markdown", "csv", "json"])
+async def test_generate_report_fetches_each_resource_once(mock_canvas, report_format):
+    result = await PeerReviewAnalyzer().generate_report(
+        1, 10, report_format=report_format
+    )
+
+    assert "error" not in result
+    assert mock_canvas["make_canvas_request"].call_count == 2
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 1
+    if report_format == "json":
+        report = json.loads(result["report"])
+        assert report["assignment_info"]["name"] == "Essay 1"
+        assert "assignment_info" not in report["analytics"]
+
+
+@pytest.mark.asyncio
+async def test_followup_list_fetches_each_resource_once(mock_canvas):
+    result = await PeerReviewAnalyzer().get_followup_list(1, 10)
+
+    assert result["assignment_info"]["name"] == "Essay 1"
+    assert result["followup_categories"]["urgent"]["count"] == 1
+    assert result["followup_categories"]["medium"]["count"] == 1
+    assert mock_canvas["make_canvas_request"].call_count == 2
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_followup_list_priority_filter(mock_canvas):
+    result = await PeerReviewAnalyzer().get_followup_list(1, 10, priority_filter="medium")
+
+    categories = result["followup_categories"]
+    assert list(categories) == ["medium"]
+    assert [s["student_name"] for s in categories["medium"]["students"]] == ["Ada"]
+    assert result["recommended_actions"]["immediate"] == [
+        "Send urgent emails to 1 students with zero completion"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_counts_students_reviewed(mock_canvas):
+    mock_canvas["fetch_all_paginated_results"].side_effect = None
+    mock_canvas["fetch_all_paginated_results"].return_value = [
+        {"id": 201, "name": "Linus"},
+        {"id": 999, "name": "Not reviewed"},
+    ]
+
+    result = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert result["summary"]["total_students_enrolled"] == 2
+    assert result["summary"]["students_with_submissions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_completion_analytics_parses_each_assigned_date_once(mock_canvas):
+    from canvas_mcp.core import dates
+
+    with patch(f"{MODULE}.parse_date", wraps=dates.parse_date) as parse:
+        result = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    # Two pending reviews share one created_at timestamp
+    assert parse.call_count == 1
+    pending = result["completion_groups"]["partial_complete"][0]["pending_reviews"][0]
+    assert pending["days_since_assigned"] > 0
+
+
+@pytest.mark.asyncio
+async def test_get_assignments_completion_fields(mock_canvas):
+    result = await PeerReviewAnalyzer().get_assignments(1, 10)
+
+    completed, pending = result["assignments"][0], result["assignments"][1]
+    assert completed["completed_date"] == "2026-01-02T00:00:00Z"
+    assert pending["status"] == "assigned"
+    assert pending["completed_date"] is None
+    assert pending["reviewee_name"] == "Barbara"
+
+
+@pytest.mark.asyncio
+async def test_markdown_report_sections(mock_canvas):
+    result = await PeerReviewAnalyzer().generate_report(1, 10)
+    report = result["report"]
+
+    assert report.startswith("# Peer Review Completion Report\n**Assignment:** Essay 1 (ID: 10)")
+    assert "| **Students with Submissions** | 3 | 60.0% |" in report
+    assert "## 🚨 Immediate Action Required" in report
+    assert "- Grace: " not in report
+    assert "- Ada: 1/2 complete, pending review of Barbara" in report
+    assert report.endswith("*Report generated using Canvas Peer Review Analytics Tool*")
+
+    bare = await PeerReviewAnalyzer().generate_report(
+        1, 10, include_executive_summary=False, include_action_items=False
+    )
+    assert "Executive Summary" not in bare["report"]
+    assert bare["report"].endswith("---\n")
+
+
+def test_markdown_report_handles_empty_roster():
+    summary = {
+        "total_students_enrolled": 0, "students_with_submissions": 0,
+        "total_reviews_assigned": 0, "reviews_completed": 0,
+        "completion_rate_percent": 0, "students_all_complete": 0,
+    }
+
+    result = PeerReviewAnalyzer()._generate_markdown_report(
+        {"summary": summary, "completion_groups": {}},
+        {"id": 10, "name": "Essay 1"},
+        True, True, True, True,
+    )
+
+    assert "| **Students with Submissions** | 0 | 0.0% |" in result["report"]
+
+
+def test_markdown_report_percentages_divide_before_scaling():
+    summary = {
+        "total_students_enrolled": 48, "students_with_submissions": 15,
+        "total_reviews_assigned": 0, "reviews_completed": 0,
+        "completion_rate_percent": 0, "students_all_complete": 27,
+    }
+
+    result = PeerReviewAnalyzer()._generate_markdown_report(
+        {"summary": summary, "completion_groups": {}},
+        {"id": 10, "name": "Essay 1"},
+        True, True, True, True,
+    )
+
+    # 15 / 48 * 100 rounds to 31.2; 15 * (100 / 48) would round to 31.3
+    assert "| **Students with Submissions** | 15 | 31.2% |" in result["report"]
+    assert "| **Students with All Reviews Complete** | 27 | 56.2% |" in result["report"]
+
+
+@pytest.mark.asyncio
+async def test_csv_report_rows(mock_canvas):
+    import csv
+    import io
+
+    result = await PeerReviewAnalyzer().generate_report(1, 10, report_format="csv")
+    rows = list(csv.reader(io.StringIO(result["report"])))
+
+    assert rows[0][0] == "student_id"
+    assert [r[7] for r in rows[1:]] == ["urgent", "medium", "low"]
+    assert rows[1][1] == "Grace"
+    assert rows[1][6] == "Linus (201)"
+    assert rows[3][6] == ""
+
+
+# ---------------------------------------------------------------------------
+# analytics cache
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_analytics_cache_reused_within_ttl(mock_canvas):
+    analyzer = PeerReviewAnalyzer()
+    report = await analyzer.generate_report(1, 10)
+    followup = await PeerReviewAnalyzer().get_followup_list(1, 10)
+
+    assert "error" not in report and "error" not in followup
+    assert mock_canvas["make_canvas_request"].call_count == 2
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_returns_independent_copies(mock_canvas):
+    first = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+    first["summary"]["total_students_enrolled"] = -1
+    first.pop("assignment_info")
+
+    second = await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert second["summary"]["total_students_enrolled"] == 5
+    assert "assignment_info" in second
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_expires(mock_canvas):
+    with patch(f"{MODULE}.time.monotonic", return_value=1000.0):
+        await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+    with patch(f"{MODULE}.time.monotonic", return_value=1031.0):
+        await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_scoped_per_token(mock_canvas):
+    from canvas_mcp.core.credentials import (
+        RequestCredentials,
+        clear_request_credentials,
+        set_request_credentials,
+    )
+
+    try:
+        set_request_credentials(RequestCredentials("token-a", "https://x/api/v1"))
+        await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+        set_request_credentials(RequestCredentials("token-b", "https://x/api/v1"))
+        await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+    finally:
+        clear_request_credentials()
+
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_analytics_errors_not_cached(mock_canvas):
+    mock_canvas["fetch_all_paginated_results"].side_effect = None
+    mock_canvas["fetch_all_paginated_results"].return_value = {"error": "denied"}
+    await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+    await PeerReviewAnalyzer().get_completion_analytics(1, 10)
+
+    assert mock_canvas["fetch_all_paginated_results"].call_count == 2
+
+
+def test_analytics_from_assignments_is_pure():
+    assignments_data = {
+        "assignment_info": {"peer_review_settings": {"reviews_per_student": 1}},
+        "assignments": [
+            {"reviewer_id": 1, "reviewee_id": 2, "status": "completed",
+             "reviewer_name": "A", "reviewee_name": "B"},
+        ],
+    }
+    with patch(f"{MODULE}.make_canvas_request") as req, \
+         patch(f"{MODULE}.fetch_all_paginated_results") as fetch:
+        result = PeerReviewAnalyzer()._analytics_from_assignments(
+            assignments_data, [{"id": 1}, {"id": 2}], True, True
+        )
+
+    req.assert_not_called()
+    fetch.assert_not_called()
+    assert result["summary"]["completion_rate_percent"] == 100.0
+    assert result["completion_groups"]["all_complete"][0]["student_name"] == "A"
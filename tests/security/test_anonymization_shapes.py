@@ -29,6 +29,7 @@ import pytest
 
 from canvas_mcp.core.anonymization import (
     anonymize_response_data,
+    scrub_free_text,
     scrub_identity,
 )
 from canvas_mcp.core.client import (
@@ -845,3 +846,18 @@ class TestScrubIdentityFlagAxes:
         record = {"id": 1, "user_id": 1, "author": "Bob Smith"}
         assert scrub_identity(record, scrub_display_names=False)["author"] == "Bob Smith"
         assert scrub_identity(record)["author"] != "Bob Smith"
+
+
+class TestScrubFreeTextPrefilters:
+    """The '@' / digit prefilters must never skip a redaction."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("no pii here", "no pii here"),
+        ("call 217-555-0100", "call [PHONE_REDACTED]"),
+        ("ssn 123-45-6789", "ssn [SSN_REDACTED]"),
+        ("mail jdoe2@illinois.edu", "mail [EMAIL_REDACTED]"),
+        ("mail a@b.co or 2175550100", "mail [EMAIL_REDACTED] or [PHONE_REDACTED]"),
+        ("5551234567@x.com", "[EMAIL_REDACTED]"),
+    ])
+    def test_redactions(self, text, expected):
+        assert scrub_free_text(text) == expected
@@ -16,7 +16,9 @@ import pytest
 from canvas_mcp.core.validation import (
     _convert_to_bool,
     _convert_to_list,
+    _parameter_validator,
     validate_parameter,
+    validate_params,
 )
 
 
@@ -356,5 +358,106 @@ class TestErrorMessages:
             assert "File" not in error_msg
 
 
+class TestExactTypeFastPath:
+    """Values already of the expected class are returned as-is."""
+
+    @pytest.mark.parametrize("value, expected_type", [
+        (5, int), ("s", str), (1.5, float), (False, bool), ([1], list), ({"a": 1}, dict),
+    ])
+    def test_identity(self, value, expected_type):
+        assert validate_parameter("p", value, expected_type) is value
+
+    def test_bool_for_int_is_still_converted(self):
+        result = validate_parameter("p", True, int)
+        assert result == 1 and type(result) is int
+
+
+class TestParameterValidator:
+    """_parameter_validator must agree with validate_parameter."""
+
+    TYPES = [
+        int, str, float, bool, list, dict, list[str], str | None, int | None,
+        int | str, int | str | None, Literal["a", "b"], Literal["a"] | None,
+    ]
+    VALUES = [None, "", "7", 7, 7.5, True, "true", "a", "x,y", "[1, 2]", '{"k": 1}', [1], {"k": 1}]
+
+    @pytest.mark.parametrize("expected_type", TYPES, ids=str)
+    def test_matches_validate_parameter(self, expected_type):
+        validate = _parameter_validator(expected_type)
+        for value in self.VALUES:
+            try:
+                expected = ("ok", validate_parameter("p", value, expected_type))
+            except ValueError as e:
+                expected = ("error", str(e))
+            try:
+                actual = ("ok", validate("p", value))
+            except ValueError as e:
+                actual = ("error", str(e))
+            assert actual == expected, (expected_type, value)
+
+    def test_exact_type_returns_same_object(self):
+        value = ["a", "b"]
+        assert _parameter_validator(list[str])("p", value) is value
+        assert _parameter_validator(int | None)("p", 5) == 5
+
+    def test_bool_is_still_converted_for_int(self):
+        result = _parameter_validator(int)("p", True)
+        assert result == 1 and type(result) is int
+
+
+class TestValidateParams:
+    """Tests for the validate_params decorator's binding and conversion."""
+
+    @staticmethod
+    def _tool():
+        calls = []
+
+        @validate_params
+        async def tool(course_id: int, name: str, limit: int = 10, tags: list | None = None) -> str:
+            calls.append((course_id, name, limit, tags))
+            return "ok"
+
+        return tool, calls
+
+    @pytest.mark.asyncio
+    async def test_keyword_call_converts_and_fills_defaults(self):
+        tool, calls = self._tool()
+        assert await tool(course_id="42", name="Essay") == "ok"
+        assert calls == [(42, "Essay", 10, None)]
+
+    @pytest.mark.asyncio
+    async def test_caller_kwargs_dict_is_not_mutated(self):
+        tool, calls = self._tool()
+        kwargs = {"course_id": "42", "name": "Essay"}
+        await tool(**kwargs)
+        assert kwargs == {"course_id": "42", "name": "Essay"}
+        assert calls == [(42, "Essay", 10, None)]
+
+    @pytest.mark.asyncio
+    async def test_positional_call_is_bound(self):
+        tool, calls = self._tool()
+        await tool("7", "Quiz", "3", tags="a,b")
+        assert calls == [(7, "Quiz", 3, ["a", "b"])]
+
+    @pytest.mark.asyncio
+    async def test_invalid_value_returns_json_error(self):
+        tool, calls = self._tool()
+        result = await tool(course_id="abc", name="Essay")
+        assert "could not be converted to int" in result
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_missing_required_argument_raises(self):
+        tool, _ = self._tool()
+        with pytest.raises(TypeError):
+            await tool(name="Essay")
+
+    @pytest.mark.asyncio
+    async def test_unknown_argument_raises(self):
+        tool, _ = self._tool()
+        with pytest.raises(TypeError):
+            await tool(course_id=1, name="Essay", bogus=True)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -191,6 +191,26 @@ class TestListUsers:
 
         assert "201" in result or "202" in result  # IDs should appear
 
+    @pytest.mark.asyncio
+    async def test_list_users_roles_deduplicated_in_order(self, mock_canvas_api):
+        """Repeated roles are listed once, in enrollment order."""
+        mock_canvas_api['fetch_all_paginated_results'].return_value = [
+            {
+                "id": 203,
+                "name": "Carol White",
+                "enrollments": [
+                    {"role": "TaEnrollment"},
+                    {"role": "StudentEnrollment"},
+                    {"role": "TaEnrollment"}
+                ]
+            }
+        ]
+
+        fn = get_tool_function('list_users')
+        result = await fn("badm_350_120251")
+
+        assert "Roles: TaEnrollment, StudentEnrollment\n" in result
+
     @pytest.mark.asyncio
     async def test_list_users_empty(self, mock_canvas_api):
         """Test when course has no users."""
@@ -151,6 +151,16 @@ class TestStripHtmlTags:
         assert "color:red" not in result
         assert "alert" not in result
 
+    def test_unclosed_script_opener_is_left_as_a_tag(self):
+        """Without a closing tag only the opener is stripped, like any other tag."""
+        result = strip_html_tags("<p>Intro</p><script>tail <style>x</style>")
+        assert result == "Intro\ntail"
+
+    def test_many_unclosed_script_openers_stay_linear(self):
+        """Unclosed openers used to make the block regex rescan the input each time."""
+        result = strip_html_tags("<script>" * 50_000 + "done")
+        assert result == "done"
+
     def test_strip_extended_entities(self):
         """Entities beyond the old 5-entry table (smart quotes, dashes, hex) decode."""
         html_content = "<p>Weeks 1&ndash;3 use the instructor&rsquo;s &#x201C;rubric&#x201D;</p>"
@@ -186,6 +196,11 @@ class TestStripHtmlTags:
         assert "Final 70%" in result
         assert "30%Final" not in result
 
+    def test_literal_less_than_before_boundary_tag(self):
+        """A bare '<' in the text must not swallow a following block or <br> tag."""
+        assert strip_html_tags("if a < b</p>then") == "if a < b\nthen"
+        assert strip_html_tags("1 < 2<br>3 > 2") == "1 2"
+
 
 class TestCourseToolsIntegration:
     """Integration tests for course tools."""
@@ -170,6 +170,60 @@ class TestGeneratePeerReviewReportFileSafety:
             "Symlink pointing outside reports_dir should fail the is_relative_to check"
         )
 
+    @staticmethod
+    def _report_tool():
+        from fastmcp import FastMCP
+
+        from canvas_mcp.tools.peer_reviews import register_peer_review_tools
+
+        mcp = FastMCP("test")
+        captured = {}
+        original_tool = mcp.tool
+
+        def capturing_tool(*args, **kwargs):
+            decorator = original_tool(*args, **kwargs)
+
+            def wrapper(fn):
+                captured[fn.__name__] = fn
+                return decorator(fn)
+
+            return wrapper
+
+        mcp.tool = capturing_tool
+        register_peer_review_tools(mcp)
+        return captured["generate_peer_review_report"]
+
+    @pytest.mark.asyncio
+    async def test_json_report_saved_to_file_reports_location(self, tmp_path, monkeypatch):
+        """Saving a JSON report must still tell the caller where it went."""
+        monkeypatch.chdir(tmp_path)
+        report = '{\n  "analytics": {}\n}'
+
+        with patch('canvas_mcp.tools.peer_reviews.get_course_id', new=AsyncMock(return_value="1")), \
+             patch('canvas_mcp.tools.peer_reviews.PeerReviewAnalyzer.generate_report',
+                   new=AsyncMock(return_value={"report": report})):
+            result = await self._report_tool()(
+                "1", 10, report_format="json", save_to_file=True, filename="out.json"
+            )
+
+        saved = (tmp_path / "reports" / "out.json").resolve()
+        assert saved.read_text(encoding="utf-8") == report
+        assert result == f"{report}\n\nSaved to: {saved}"
+
+    @pytest.mark.asyncio
+    async def test_report_save_failure_is_reported(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        with patch('canvas_mcp.tools.peer_reviews.get_course_id', new=AsyncMock(return_value="1")), \
+             patch('canvas_mcp.tools.peer_reviews.PeerReviewAnalyzer.generate_report',
+                   new=AsyncMock(return_value={"report": "{}"})), \
+             patch('builtins.open', side_effect=OSError("disk full")):
+            result = await self._report_tool()(
+                "1", 10, report_format="json", save_to_file=True, filename="out.json"
+            )
+
+        assert result == "{}\n\nSave failed: Failed to save file: disk full"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])